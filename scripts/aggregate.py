@@ -1,18 +1,29 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import os, re, json, logging, pathlib, sys, hashlib, argparse, random
+import os, re, json, logging, pathlib, sys, hashlib, argparse, functools, gzip, heapq, itertools, queue, atexit, contextlib
 from datetime import datetime, timedelta, timezone
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin, urlparse, urlsplit
+from email.utils import parsedate_to_datetime
 
 import requests
+import threading
 import time
 from collections import defaultdict
+from operator import itemgetter
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+import multiprocessing
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+import soupsieve
 from dateutil import parser as dparser
-import pytz
+from zoneinfo import ZoneInfo
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup, stdlib json fallback
+    orjson = None
 
 try:
     from scripts.url_filters import is_listing_url
@@ -22,6 +33,7 @@ except ModuleNotFoundError:  # pragma: no cover - fallback when run as a script
 try:
     from scripts.http_client import (
         HostClient,
+        HostRateLimiter,
         RequestStrategy,
         SourceTemporarilyUnavailable,
         build_strategy_registry,
@@ -30,6 +42,7 @@ try:
 except ModuleNotFoundError:  # pragma: no cover - fallback when run as a script
     from http_client import (  # type: ignore
         HostClient,
+        HostRateLimiter,
         RequestStrategy,
         SourceTemporarilyUnavailable,
         build_strategy_registry,
@@ -49,7 +62,31 @@ READ_TIMEOUT = 10.0
 REQUEST_TIMEOUT = (CONNECT_TIMEOUT, READ_TIMEOUT)
 USER_AGENT = DEFAULT_USER_AGENT
 MAX_LINKS_PER_SOURCE = 100
+MAX_STATE_HEADERS = 50_000  # ETag/Last-Modified храним только для недавно запрошенных URL
+MAX_STATE_FIRST_SEEN = 50_000  # first_seen нужен, пока карточка может вернуться в ленту
+MAX_STATE_ERRORS = 200  # stats.errors — журнал последних ошибок, а не вся история
 FEED_MAX_ITEMS = int(os.environ.get("FEED_MAX_ITEMS", "2000"))
+FETCH_WORKERS = max(1, int(os.environ.get("FETCH_WORKERS", "4")))
+# Источники собираются параллельно; паузы по хосту общие (RATE_LIMITER)
+SOURCE_WORKERS = max(1, int(os.environ.get("SOURCE_WORKERS", "4")))
+
+
+def _parse_workers_from_env(value: str) -> int:
+    """PARSE_WORKERS: >0 — разбирать HTML статей в отдельных процессах (parse_article),
+    0 — в текущем, "auto" — по числу ядер. Непонятное значение — предупреждение и 0."""
+    value = (value or "0").strip().lower()
+    if value == "auto":
+        return os.cpu_count() or 1
+    try:
+        return max(0, int(value))
+    except ValueError:
+        # logging.basicConfig ещё не вызван: пишем через именованный логгер,
+        # чтобы не сконфигурировать корневой раньше времени
+        logging.getLogger(__name__).warning("PARSE_WORKERS=%r не число и не 'auto' — разбор в текущем процессе", value)
+        return 0
+
+
+PARSE_WORKERS = _parse_workers_from_env(os.environ.get("PARSE_WORKERS", "0"))
 ARGS = None  # будет заполнено в main()
 SMOKE_DEFAULT_SOURCES = {
     "НОТИМ",
@@ -73,48 +110,167 @@ SOURCE_SUMMARY: dict[str, dict[str, int]] = defaultdict(
 SOURCE_MIN_WORDS: dict[str, int] = {}
 
 # Перехваты ошибок/429 и паузы между запросами к одному хосту
+# Одна сессия на весь прогон: keep-alive и сжатие (requests сам выставляет Accept-Encoding)
 SESSION = requests.Session()
+SESSION.headers["User-Agent"] = USER_AGENT
 _retry = Retry(
     total=5, connect=3, read=3, backoff_factor=1.5,
     status_forcelist=[429,500,502,503,504],
     allowed_methods=["GET","HEAD"]
 )
-_adapter = HTTPAdapter(max_retries=_retry)
+# pool_connections — сколько хостов держим с живыми соединениями (источники + AMP/CDN),
+# pool_maxsize — одновременных соединений к одному хосту: до FETCH_WORKERS на каждый
+# из параллельно собираемых источников
+_adapter = HTTPAdapter(
+    max_retries=_retry,
+    pool_connections=64,
+    pool_maxsize=max(32, FETCH_WORKERS * SOURCE_WORKERS),
+)
 SESSION.mount("http://", _adapter)
 SESSION.mount("https://", _adapter)
 HOST_DELAY_DEFAULT = 1.5
 HOST_DELAY_OVERRIDES = {"www.metalinfo.ru": 6.0, "metalinfo.ru": 6.0, "www.pnp.ru": 6.0, "pnp.ru": 6.0}
-_last_req_at = defaultdict(lambda: 0.0)
+RATE_LIMITER = HostRateLimiter(HOST_DELAY_DEFAULT, HOST_DELAY_OVERRIDES, override_jitter=2.0)
+_host_clients_lock = threading.Lock()
 
-MSK = pytz.timezone("Europe/Moscow")
+MSK = ZoneInfo("Europe/Moscow")
 
-LOG_PATH = pathlib.Path("/tmp/rebuild.log")
-logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 try:
-    file_handler = logging.FileHandler(LOG_PATH, mode="a", encoding="utf-8")
-    file_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
-    logging.getLogger().addHandler(file_handler)
-except OSError:
-    logging.warning("Unable to attach log file handler at %s", LOG_PATH)
+    from lxml import etree as lxml_etree, html as lxml_html  # C-парсер для BeautifulSoup
+    HTML_PARSER = "lxml"
+except ImportError:  # pragma: no cover - lxml is pinned in requirements.txt
+    lxml_etree = lxml_html = None
+    HTML_PARSER = "html.parser"
+
+LOG_PATH = pathlib.Path("/tmp/rebuild.log")
 
-# ---- State ----
-CACHE_DIR.mkdir(exist_ok=True)
-PAGES_DIR.mkdir(exist_ok=True)
-DOCS_DIR.mkdir(exist_ok=True)
 
-if STATE_FILE.exists():
-    STATE = json.loads(STATE_FILE.read_text(encoding="utf-8"))
-else:
-    STATE = {"headers": {}, "stats": {}, "index_hash": {}, "seen_urls": {}}
+def setup_logging() -> None:
+    """Console + /tmp/rebuild.log; вызывается из main(), а не при импорте:
+    модуль импортируют и процессы разбора (PARSE_WORKERS)."""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    try:
+        file_handler = logging.FileHandler(LOG_PATH, mode="a", encoding="utf-8")
+        file_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+        logging.getLogger().addHandler(file_handler)
+    except OSError:
+        logging.warning("Unable to attach log file handler at %s", LOG_PATH)
 
-STATE.setdefault("first_seen", {})
-STATE.setdefault("host_state", {})
+
+# ---- JSON I/O ----
+def json_loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def read_json(path: pathlib.Path):
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with path.open(encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def _atomic_write_bytes(path: pathlib.Path, data: bytes) -> None:
+    # Пишем рядом и подменяем: прерванный запуск не оставит обрезанный файл
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def write_json(path: pathlib.Path, data) -> None:
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        payload = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    _atomic_write_bytes(path, payload)
+
+
+# ---- State ----
+# Пустое состояние при импорте; state.json читает load_state() из main().
+# Процессы разбора импортируют модуль заново и не должны трогать диск.
+STATE = {"headers": {}, "stats": {}, "index_hash": {}, "seen_urls": {}, "first_seen": {}, "host_state": {}}
+
+
+def load_state() -> None:
+    """Create the cache/output dirs and load state.json into STATE (in place)."""
+    CACHE_DIR.mkdir(exist_ok=True)
+    PAGES_DIR.mkdir(exist_ok=True)
+    DOCS_DIR.mkdir(exist_ok=True)
+    if STATE_FILE.exists():
+        loaded = read_json(STATE_FILE)
+        STATE.clear()
+        STATE.update(loaded)
+    STATE.setdefault("first_seen", {})
+    STATE.setdefault("host_state", {})
+
+# Источники собираются в нескольких потоках (run_source): общие части STATE
+# меняются только под этим замком
+_STATE_LOCK = threading.Lock()
 
 HOST_STRATEGIES: dict[str, RequestStrategy] = {}
 HOST_CLIENTS: dict[str, HostClient] = {}
 
+def remember_headers(url: str, hinfo: dict) -> None:
+    """Store validators for ``url`` as most recently used (dict order = LRU)."""
+    with _STATE_LOCK:
+        headers = STATE.setdefault("headers", {})
+        headers.pop(url, None)
+        headers[url] = hinfo
+
+
+def record_error(entry: dict) -> None:
+    """Append ``entry`` to STATE["stats"]["errors"] (safe across source threads)."""
+    with _STATE_LOCK:
+        STATE.setdefault("stats", {}).setdefault("errors", []).append(entry)
+
+
+def set_cooldown(url: str, seconds: float) -> None:
+    """Не ходить к ``url`` ближайшие ``seconds`` секунд (stats.cooldowns)."""
+    with _STATE_LOCK:
+        STATE.setdefault("stats", {}).setdefault("cooldowns", {})[url] = time.time() + seconds
+
+
+def remember_index_digest(url: str, digest: str) -> None:
+    """Store the index fingerprint used to skip unchanged feeds next run."""
+    with _STATE_LOCK:
+        STATE.setdefault("index_hash", {})[url] = digest
+
+
+def trim_state_headers() -> None:
+    headers = STATE.get("headers") or {}
+    excess = len(headers) - MAX_STATE_HEADERS
+    if excess > 0:
+        for url in list(itertools.islice(headers, excess)):
+            del headers[url]
+
+
+def trim_state_history() -> None:
+    """Bound the parts of STATE that otherwise grow with every run."""
+    first_seen = STATE.get("first_seen") or {}
+    excess = len(first_seen) - MAX_STATE_FIRST_SEEN
+    if excess > 0:
+        # dict хранит порядок вставки — первыми уходят самые старые id
+        for item_id in list(itertools.islice(first_seen, excess)):
+            del first_seen[item_id]
+    stats = STATE.get("stats") or {}
+    errors = stats.get("errors")
+    if isinstance(errors, list) and len(errors) > MAX_STATE_ERRORS:
+        del errors[:-MAX_STATE_ERRORS]
+    cooldowns = stats.get("cooldowns")
+    if isinstance(cooldowns, dict):
+        now = time.time()
+        for url in [u for u, until in cooldowns.items() if not until or until <= now]:
+            del cooldowns[url]
+
+
 def save_state():
-    STATE_FILE.write_text(json.dumps(STATE, ensure_ascii=False, indent=2), encoding="utf-8")
+    # Хэши индексов в состоянии должны ссылаться на уже записанный кеш
+    flush_page_cache()
+    with _STATE_LOCK:
+        trim_state_headers()
+        trim_state_history()
+        write_json(STATE_FILE, STATE)
 
 
 def runtime_expired() -> bool:
@@ -138,38 +294,112 @@ def runtime_expired() -> bool:
     return False
 
 # ---- HTTP ----
+@functools.lru_cache(maxsize=8192)
+def url_host(url: str) -> str:
+    """urlparse(url).netloc, memoized: один и тот же URL/хост встречается много раз."""
+    return urlsplit(url).netloc
+
+
 def _get_host_for_source(src: dict | None) -> str | None:
     if not src:
         return None
     base = src.get("base_url") or src.get("start_url")
     if not base:
         return None
-    return urlparse(base).netloc
+    return url_host(base)
 
 
 def get_host_client(url: str, src: dict | None = None) -> HostClient | None:
-    host = urlparse(url).netloc
+    host = url_host(url)
     src_host = _get_host_for_source(src)
     if src_host:
         host = src_host
     strategy = HOST_STRATEGIES.get(host)
     if not strategy:
         return None
-    client = HOST_CLIENTS.get(host)
-    if client is None:
-        client = HostClient(host, strategy, STATE)
-        HOST_CLIENTS[host] = client
+    with _host_clients_lock:
+        client = HOST_CLIENTS.get(host)
+        if client is None:
+            # HostClient заводит себе записи в STATE["host_state"] и stats.metrics
+            with _STATE_LOCK:
+                client = HostClient(host, strategy, STATE)
+            HOST_CLIENTS[host] = client
     return client
 
 
+def _retry_after_seconds(resp, default: int = 5) -> int:
+    ra = resp.headers.get("Retry-After")
+    try:
+        return int(ra) if ra else default
+    except ValueError:
+        return default
+
+
+def _head_unchanged(url: str, hdrs: dict, hinfo: dict) -> bool:
+    """Cheap HEAD precheck for servers that ignore conditional GET headers."""
+
+    try:
+        resp = SESSION.head(url, headers=hdrs, timeout=REQUEST_TIMEOUT, allow_redirects=True)
+    except requests.exceptions.RequestException as exc:
+        logging.debug("HEAD precheck failed for %s: %s", url, exc)
+        return False
+    if resp.status_code == 304:
+        return True
+    if resp.status_code != 200:
+        return False
+    lm = resp.headers.get("Last-Modified")
+    if not lm or lm != hinfo.get("Last-Modified"):
+        return False
+    et = resp.headers.get("ETag")
+    if et and hinfo.get("ETag") and et != hinfo["ETag"]:
+        return False
+    return True
+
+
+_RE_HEAD_CHARSET = re.compile(
+    rb"""<meta[^>]+charset=["']?([\w-]+)|<\?xml[^>]+encoding=["']([\w-]+)""",
+    re.IGNORECASE,
+)
+
+
+def response_text(resp) -> str:
+    """resp.text, но без угадывания кодировки (chardet) в частом случае.
+
+    Если charset не указан в заголовке, берём его из <meta>/<?xml ...?>
+    в начале документа, затем пробуем UTF-8; угадывание — только в крайнем случае.
+    """
+    if "charset=" in resp.headers.get("Content-Type", "").lower():
+        return resp.text
+    raw = resp.content
+    m = _RE_HEAD_CHARSET.search(raw[:4096])
+    if m:
+        try:
+            return raw.decode((m.group(1) or m.group(2)).decode("ascii"), errors="replace")
+        except LookupError:
+            pass
+    try:
+        return raw.decode("utf-8")
+    except UnicodeDecodeError:
+        return resp.text
+
+
+PAGE_REQUEST_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "ru,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Connection": "keep-alive",
+}
+API_REQUEST_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "application/json",
+    "Accept-Language": "ru,en;q=0.9",
+}
+
+
 def http_get(url: str, allow_conditional: bool = True, src: dict | None = None):
-    hdrs = {
-        "User-Agent": USER_AGENT,
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "ru,en;q=0.9",
-        "Accept-Encoding": "gzip, deflate, br",
-        "Connection": "keep-alive",
-    }
+    # Копия: ниже добавляются условные заголовки конкретного URL
+    hdrs = dict(PAGE_REQUEST_HEADERS)
     hinfo = STATE["headers"].get(url, {})
     if allow_conditional:
         if "ETag" in hinfo:
@@ -177,17 +407,29 @@ def http_get(url: str, allow_conditional: bool = True, src: dict | None = None):
         if "Last-Modified" in hinfo:
             hdrs["If-Modified-Since"] = hinfo["Last-Modified"]
 
-    # Пауза по хосту
-    host = urlparse(url).netloc
-    delay = HOST_DELAY_OVERRIDES.get(host, HOST_DELAY_DEFAULT)
-    now = time.time()
-    sleep_for = _last_req_at[host] + delay - now
-    if sleep_for > 0:
-        time.sleep(sleep_for)
-    if host in HOST_DELAY_OVERRIDES:
-        time.sleep(random.uniform(0, 2))
+    # Пауза по хосту: запрос к хосту один за раз, следующий — через интервал после ответа
+    host = url_host(url)
     client = get_host_client(url, src)
+    RATE_LIMITER.acquire(host)
+    # 304 почти ничего не стоит серверу — не держим паузу до следующего запроса
+    refund = False
     try:
+        # HEAD — только для хостов, замеченных в игнорировании If-Modified-Since;
+        # для хостов со стратегией (антиботы) лишний HEAD не шлём
+        if (
+            allow_conditional
+            and not client
+            and "Last-Modified" in hinfo
+            and host in STATE.get("conditional_get_ignored", {})
+        ):
+            if _head_unchanged(url, hdrs, hinfo):
+                logging.info("Unchanged per HEAD: %s", url)
+                refund = True
+                remember_headers(url, hinfo)
+                return None, hinfo
+            # HEAD тоже нагружает хост: перед GET выдерживаем обычную паузу
+            RATE_LIMITER.release(host)
+            RATE_LIMITER.acquire(host)
         if client:
             timeout_value = None if client.strategy.timeout else REQUEST_TIMEOUT
             resp = client.get(
@@ -203,28 +445,26 @@ def http_get(url: str, allow_conditional: bool = True, src: dict | None = None):
                 timeout=REQUEST_TIMEOUT,
                 allow_redirects=True,
             )
-    except SourceTemporarilyUnavailable:
-        raise
-    except requests.exceptions.RequestException as exc:
-        raise
-    _last_req_at[host] = time.time()
-    if not client and resp.status_code == 429:
-        ra = resp.headers.get("Retry-After")
-        try:
-            wait = int(ra) if ra else 5
-        except ValueError:
-            wait = 5
-        logging.warning("429 Too Many Requests: %s -> sleep %ss", url, wait)
-        time.sleep(wait)
-        resp = SESSION.get(
-            url,
-            headers=hdrs,
-            timeout=REQUEST_TIMEOUT,
-            allow_redirects=True,
-        )
-        _last_req_at[host] = time.time()
+        if not client and resp.status_code == 429:
+            wait = _retry_after_seconds(resp)
+            logging.warning("429 Too Many Requests: %s -> sleep %ss", url, wait)
+            RATE_LIMITER.defer(host, wait)
+            RATE_LIMITER.wait(host)
+            resp = SESSION.get(
+                url,
+                headers=hdrs,
+                timeout=REQUEST_TIMEOUT,
+                allow_redirects=True,
+            )
+        if resp.status_code == 304:
+            refund = True
+    finally:
+        RATE_LIMITER.release(host, refund=refund)
     if resp.status_code == 304:
         logging.info("304 Not Modified: %s", url)
+        with _STATE_LOCK:
+            STATE.setdefault("conditional_get_ignored", {}).pop(host, None)
+        remember_headers(url, hinfo)
         return None, hinfo
     resp.raise_for_status()
     new_hinfo = {}
@@ -234,15 +474,44 @@ def http_get(url: str, allow_conditional: bool = True, src: dict | None = None):
         new_hinfo["ETag"] = et
     if lm:
         new_hinfo["Last-Modified"] = lm
-    STATE["headers"][url] = new_hinfo
-    return resp.text, new_hinfo
-
-def cache_key_for(url: str) -> str:
+    # Полный ответ при прежнем Last-Modified: сервер не понимает условный GET —
+    # дальше для этого хоста проверяем страницы дешёвым HEAD
+    if allow_conditional and lm and lm == hinfo.get("Last-Modified"):
+        with _STATE_LOCK:
+            ignored_hosts = STATE.setdefault("conditional_get_ignored", {})
+            newly_ignored = host not in ignored_hosts
+            ignored_hosts[host] = True
+        if newly_ignored:
+            logging.info("Conditional GET ignored by %s, will precheck with HEAD", host)
+    remember_headers(url, new_hinfo)
+    return response_text(resp), new_hinfo
+
+# Всё, кроме ASCII-букв и цифр, -> "-" (таблица для bytes.translate)
+_SLUG_TABLE = bytes(c if chr(c).isascii() and chr(c).isalnum() else ord("-") for c in range(256))
+
+
+def _slugify_path(path: str) -> str:
+    """Same as re.sub(r"[^a-zA-Z0-9]+", "-", path).strip("-"), without the regex engine."""
+    raw = path.encode("ascii", "replace").translate(_SLUG_TABLE).decode("ascii")
+    return "-".join(filter(None, raw.split("-")))
+
+
+# Ключ кеша нужен на каждое чтение/запись страницы — считаем один раз на URL
+@functools.lru_cache(maxsize=4096)
+def cache_key_for(url: str, legacy_query_hash: bool = False) -> str:
+    """Имя файла кеша для ``url``.
+
+    ``legacy_query_hash`` — старая схема (усечённый SHA-1 запроса): под ней лежат
+    страницы, скачанные до перехода на blake2b, и к ним привязаны сохранённые ETag.
+    """
     p = urlparse(url)
-    slug = re.sub(r"[^a-zA-Z0-9]+", "-", (p.path or "/")).strip("-")
+    slug = _slugify_path(p.path or "/")
     query = (p.query or "").strip()
     if query:
-        q_hash = hashlib.sha1(query.encode("utf-8")).hexdigest()[:10]
+        if legacy_query_hash:
+            q_hash = hashlib.sha1(query.encode("utf-8")).hexdigest()[:10]
+        else:
+            q_hash = hashlib.blake2b(query.encode("utf-8"), digest_size=5).hexdigest()
         slug = f"{slug}-{q_hash}" if slug else q_hash
     if not slug:
         slug = "index"
@@ -250,6 +519,13 @@ def cache_key_for(url: str) -> str:
         slug = slug[:150]
     return f"{p.netloc}-{slug}.html"
 
+def index_digest(text: str) -> str:
+    """Отпечаток индекса для пропуска неизменённых лент (не криптография).
+
+    После перехода с SHA-256 каждая лента один раз считается изменённой.
+    """
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
 def cache_key_with_suffix(base_key: str, suffix: str) -> str:
     if base_key.endswith(".html"):
         return f"{base_key[:-5]}{suffix}.html"
@@ -268,36 +544,126 @@ def _amp_append_allowed(host: str) -> bool:
     return host in AMP_APPEND_WHITELIST
 
 
-def fetch_page(url: str, src: dict | None = None) -> str:
-    page_path = PAGES_DIR / cache_key_for(url)
+def page_cache_path(url: str) -> pathlib.Path:
+    return PAGES_DIR / f"{cache_key_for(url)}.gz"
+
+
+def read_cached_page(url: str) -> str | None:
+    """Cached HTML for ``url`` (gzip, or a legacy plain .html file) or None.
+
+    URL с query ищутся и под старым именем файла (SHA-1), чтобы 304 по
+    сохранённым валидаторам не оставлял статью без текста.
+    """
+    path = page_cache_path(url)
+    with _pending_pages_lock:
+        pending = _PENDING_PAGES.get(path)
+    if pending is not None:
+        return pending
+    keys = [cache_key_for(url)]
+    if urlparse(url).query.strip():
+        keys.append(cache_key_for(url, legacy_query_hash=True))
+    for key in keys:
+        try:
+            with gzip.open(PAGES_DIR / f"{key}.gz", "rt", encoding="utf-8") as fh:
+                return fh.read()
+        except (OSError, EOFError):
+            pass
+        try:
+            return (PAGES_DIR / key).read_text(encoding="utf-8")
+        except OSError:
+            pass
+    return None
+
+
+# Кеш страниц пишется фоновым потоком: сжатие и запись на диск не держат
+# воркеры скачивания. Пока страница в очереди, read_cached_page отдаёт её из памяти.
+_PAGE_WRITE_QUEUE: "queue.Queue[pathlib.Path]" = queue.Queue()
+_PENDING_PAGES: dict[pathlib.Path, str] = {}
+_pending_pages_lock = threading.Lock()
+_page_writer: threading.Thread | None = None
+
+
+def _page_writer_loop() -> None:
+    while True:
+        path = _PAGE_WRITE_QUEUE.get()
+        try:
+            with _pending_pages_lock:
+                content = _PENDING_PAGES.get(path)
+            # Повторная постановка той же страницы уже записана — пропускаем
+            if content is not None:
+                _atomic_write_bytes(path, gzip.compress(content.encode("utf-8"), compresslevel=1))
+                with _pending_pages_lock:
+                    if _PENDING_PAGES.get(path) is content:
+                        del _PENDING_PAGES[path]
+        except OSError as exc:
+            logging.warning("Page cache write failed for %s: %s", path, exc)
+            with _pending_pages_lock:
+                _PENDING_PAGES.pop(path, None)
+        finally:
+            _PAGE_WRITE_QUEUE.task_done()
+
+
+def write_cached_page(url: str, content: str) -> None:
+    """Ставит страницу в очередь на запись; на диск она попадает асинхронно."""
+    global _page_writer
+    path = page_cache_path(url)
+    with _pending_pages_lock:
+        _PENDING_PAGES[path] = content
+        if _page_writer is None:
+            _page_writer = threading.Thread(target=_page_writer_loop, name="page-cache-writer", daemon=True)
+            _page_writer.start()
+    _PAGE_WRITE_QUEUE.put(path)
+
+
+def flush_page_cache() -> None:
+    """Дождаться записи всех страниц из очереди."""
+    if _page_writer is not None:
+        _PAGE_WRITE_QUEUE.join()
+
+
+atexit.register(flush_page_cache)
+
+
+def fetch_page(
+    url: str, src: dict | None = None, skip_if_unchanged: bool = False, write_cache: bool = True
+) -> str | None:
+    """Текст страницы; при ``skip_if_unchanged`` на 304/HEAD-совпадение — None без чтения кеша.
+
+    ``write_cache=False`` — вызывающий сам решит, сохранять ли страницу (write_cached_page).
+    """
     use_conditional = not (ARGS and getattr(ARGS, 'rebuild', False))
     try:
         content, _ = http_get(url, allow_conditional=use_conditional, src=src)
     except requests.HTTPError as exc:
         status = exc.response.status_code if exc.response is not None else None
-        if status in {500, 502, 503, 504} and page_path.exists():
+        cached = read_cached_page(url) if status in {500, 502, 503, 504} else None
+        if cached is not None:
             logging.warning(
                 "HTTP %s for %s — using cached copy", status, url
             )
-            return page_path.read_text(encoding="utf-8")
+            return cached
         raise
     except SourceTemporarilyUnavailable:
         raise
-    if content is None and page_path.exists():
-        # Not modified -> reuse cached
-        return page_path.read_text(encoding="utf-8")
     if content is None:
+        if skip_if_unchanged:
+            return None
+        # Not modified -> reuse cached
+        cached = read_cached_page(url)
+        if cached is not None:
+            return cached
         # No cached file (first run) but server returned 304 (edge case) -> force GET
-        content = requests.get(
+        content = response_text(SESSION.get(
             url,
             headers={"User-Agent": USER_AGENT},
             timeout=REQUEST_TIMEOUT,
-        ).text
-    page_path.write_text(content, encoding="utf-8")
+        ))
+    if write_cache:
+        write_cached_page(url, content)
     return content
 
 
-def fetch_amp_if_available(url: str, soup: BeautifulSoup, src: dict | None = None) -> str | None:
+def find_amp_url(url: str, soup: BeautifulSoup) -> str | None:
     amp_href = None
     for link in soup.find_all("link"):
         rel = link.get("rel")
@@ -313,13 +679,17 @@ def fetch_amp_if_available(url: str, soup: BeautifulSoup, src: dict | None = Non
                 amp_href = urljoin(url, href)
                 break
     if amp_href is None:
-        host = urlparse(url).netloc
+        host = url_host(url)
         if _amp_append_allowed(host):
             base = url.rstrip("/")
             if base and not base.endswith("/amp"):
                 amp_href = f"{base}/amp"
     if not amp_href or amp_href == url:
         return None
+    return amp_href
+
+
+def fetch_amp_page(amp_href: str, src: dict | None = None) -> str | None:
     try:
         return fetch_page(amp_href, src=src)
     except Exception as exc:
@@ -333,6 +703,23 @@ RU_MONTHS = {
     "янв":1, "фев":2, "мар":3, "апр":4, "май":5, "июн":6, "июл":7, "авг":8, "сен":9, "сент":9, "окт":10, "ноя":11, "дек":12
 }
 
+_RE_WS = re.compile(r"\s+")
+_RE_DOT_DATE = re.compile(r"(\d{1,2})\.(\d{1,2})\.(\d{4})(?:[ T](\d{1,2}):(\d{2}))?")
+# Только известные названия месяцев; длинные формы раньше коротких («сентября» до «сен»)
+_RU_MONTHS_ALT = "|".join(sorted(RU_MONTHS, key=len, reverse=True))
+_RE_WORDS_DATE = re.compile(
+    rf"(\d{{1,2}})\s+({_RU_MONTHS_ALT})\s+(\d{{4}})(?:[ ,](\d{{1,2}}):(\d{{2}}))?",
+    re.IGNORECASE,
+)
+_RE_SHORT_DATE = re.compile(r"(\d{1,2})\.(\d{1,2})\.(\d{2})(?:[ T](\d{1,2}):(\d{2}))?")
+# Три формы одной альтернацией: обычно хватает одного прохода по строке
+_RE_ANY_RU_DATE = re.compile(
+    "|".join(f"(?:{r.pattern})" for r in (_RE_DOT_DATE, _RE_WORDS_DATE, _RE_SHORT_DATE)),
+    re.IGNORECASE,
+)
+_RE_HHMM = re.compile(r"(\d{1,2}):(\d{2})")
+_RE_URL_DATE = re.compile(r"/(20\d{2})/([01]\d)/([0-3]\d)/")
+
 def clamp_year(dt: datetime):
     if dt.year < 2000 or dt.year > 2035:
         return None
@@ -340,45 +727,45 @@ def clamp_year(dt: datetime):
 
 def make_aware_msk(dt: datetime):
     if dt.tzinfo is None:
-        return MSK.localize(dt)
+        return dt.replace(tzinfo=MSK)
     return dt.astimezone(MSK)
 
+def _ru_date_match(s: str):
+    """(kind, groups) of the highest-priority form: dd.mm.yyyy, then words, then dd.mm.yy."""
+    m = _RE_ANY_RU_DATE.search(s)
+    if not m:
+        return None
+    groups = m.groups()
+    if groups[0] is not None:
+        return "dot", groups[:5]
+    # Более приоритетные формы могут встретиться только правее найденной
+    pos = m.start() + 1
+    later = _RE_DOT_DATE.search(s, pos)
+    if later:
+        return "dot", later.groups()
+    if groups[5] is not None:
+        return "words", groups[5:10]
+    later = _RE_WORDS_DATE.search(s, pos)
+    if later:
+        return "words", later.groups()
+    return "short", groups[10:]
+
+
 def parse_ru_date_words(s: str):
     # Examples: "19 сентября 2024, 12:34", "19 сент 2024", "19.09.2024 12:34"
-    s = re.sub(r"\s+", " ", s.strip())
-    # dd.mm.yyyy HH:MM
-    m = re.search(r"(\d{1,2})\.(\d{1,2})\.(\d{4})(?:[ T](\d{1,2}):(\d{2}))?", s)
-    if m:
-        d, mo, y = int(m.group(1)), int(m.group(2)), int(m.group(3))
-        hh, mm = (int(m.group(4) or 0), int(m.group(5) or 0))
-        try:
-            return clamp_year(datetime(y, mo, d, hh, mm))
-        except ValueError:
-            return None
-    # "19 сентября 2024", optionally time
-    m = re.search(r"(\d{1,2})\s+([А-Яа-яёЁ]+)\s+(\d{4})(?:[ ,](\d{1,2}):(\d{2}))?", s)
-    if m:
-        d = int(m.group(1))
-        month_name = m.group(2).lower()
-        y = int(m.group(3))
-        mo = RU_MONTHS.get(month_name)
-        if mo:
-            hh, mm = (int(m.group(4) or 0), int(m.group(5) or 0))
-            try:
-                return clamp_year(datetime(y, mo, d, hh, mm))
-            except ValueError:
-                return None
-    # dd.mm.yy
-    m = re.search(r"(\d{1,2})\.(\d{1,2})\.(\d{2})(?:[ T](\d{1,2}):(\d{2}))?", s)
-    if m:
-        d, mo, yy = int(m.group(1)), int(m.group(2)), int(m.group(3))
-        y = 2000 + yy
-        hh, mm = (int(m.group(4) or 0), int(m.group(5) or 0))
-        try:
-            return clamp_year(datetime(y, mo, d, hh, mm))
-        except ValueError:
-            return None
-    return None
+    found = _ru_date_match(_RE_WS.sub(" ", s.strip()))
+    if not found:
+        return None
+    kind, (d, mo, y, hh, mm) = found
+    if kind == "words":
+        mo = RU_MONTHS[mo.lower()]
+    y = int(y)
+    if kind == "short":
+        y += 2000
+    try:
+        return clamp_year(datetime(y, int(mo), int(d), int(hh or 0), int(mm or 0)))
+    except ValueError:
+        return None
 
 def finalize_datetime(dt: datetime):
     if dt is None:
@@ -418,25 +805,76 @@ DEFAULT_CONTENT_SELECTORS = [
     ".presscenter__content",
     "#news-detail",
 ]
+_DEFAULT_CONTENT_ANY = soupsieve.compile(", ".join(DEFAULT_CONTENT_SELECTORS))
+_DEFAULT_CONTENT_PATTERNS = [soupsieve.compile(sel) for sel in DEFAULT_CONTENT_SELECTORS]
+
+
+def iter_default_content_nodes(soup):
+    """Узлы по DEFAULT_CONTENT_SELECTORS в порядке списка, за один обход дерева.
+
+    Порядок тот же, что у цикла soup.select(sel): узел относится к первому
+    подходящему селектору, внутри селектора — порядок документа.
+    """
+    buckets = [[] for _ in _DEFAULT_CONTENT_PATTERNS]
+    for node in _DEFAULT_CONTENT_ANY.select(soup):
+        for idx, pattern in enumerate(_DEFAULT_CONTENT_PATTERNS):
+            if pattern.match(node):
+                buckets[idx].append(node)
+                break
+    for nodes in buckets:
+        for node in nodes:
+            # Узел мог быть удалён вместе с мусором из предыдущего кандидата
+            if not node.decomposed:
+                yield node
+
+# Любой пробельный отрезок с переводом строки (те же разделители, что у splitlines)
+_RE_LINE_BREAK_WS = re.compile(r"\s*[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]\s*")
+
 
 def _normalize_whitespace(text: str) -> str:
+    """Строки без краевых пробелов и без пустых строк — одной заменой вместо цикла."""
     if not text:
         return ""
-    lines = [line.strip() for line in text.splitlines()]
-    lines = [line for line in lines if line]
-    return "\n".join(lines)
+    return _RE_LINE_BREAK_WS.sub("\n", text).strip()
+
+
+def element_lines(elem) -> str:
+    """_normalize_whitespace(elem.get_text("\n", strip=True)) за один проход по строкам.
+
+    Строки из stripped_strings уже без краевых пробелов; повторно нормализуем
+    только те, что содержат переводы строк (у них isprintable() ложно).
+    """
+    return "\n".join(
+        s if s.isprintable() else _normalize_whitespace(s) for s in elem.stripped_strings
+    )
+
+
+_RE_WORD = re.compile(r"\w+")
+_RE_HTML_TAG = re.compile(r"<[a-zA-Z][^>]*>")
 
 
 def _word_count(text: str) -> int:
     if not text:
         return 0
-    return len(re.findall(r"\w+", text, flags=re.UNICODE))
+    return len(_RE_WORD.findall(text))
+
+
+def make_soup(markup: str, features: str = HTML_PARSER, **kwargs) -> BeautifulSoup:
+    """BeautifulSoup на lxml; при сбое lxml на битой разметке — html.parser."""
+    try:
+        return BeautifulSoup(markup, features, **kwargs)
+    except Exception as exc:
+        if features == "html.parser":
+            raise
+        logging.debug("%s failed (%s), falling back to html.parser", features, exc)
+        return BeautifulSoup(markup, "html.parser", **kwargs)
 
 
 def _clone_soup(doc: BeautifulSoup | str | None) -> BeautifulSoup:
+    # Копия нужна, т.к. _clean_for_content вырезает узлы; пересобираем тем же C-парсером
     if isinstance(doc, BeautifulSoup):
-        return BeautifulSoup(str(doc), "html.parser")
-    return BeautifulSoup(doc or "", "html.parser")
+        return make_soup(str(doc))
+    return make_soup(doc or "")
 
 
 def _clean_for_content(soup: BeautifulSoup) -> None:
@@ -444,22 +882,25 @@ def _clean_for_content(soup: BeautifulSoup) -> None:
         junk.decompose()
 
 
+_RE_TITLE_SEP = re.compile(r"[\s\-–—:]*")
+
+
 def _drop_leading_title(text: str, title: str | None) -> str:
     if not text:
         return ""
     if not title:
         return text.strip()
-    title_norm = re.sub(r"\s+", " ", title).strip()
+    title_norm = _RE_WS.sub(" ", title).strip()
     if not title_norm:
         return text.strip()
     trimmed = text.lstrip()
-    pattern = re.compile(rf"^{re.escape(title_norm)}[\s\-–—:]*", re.IGNORECASE)
-    new_text = pattern.sub("", trimmed, count=1)
-    if new_text != trimmed:
-        return new_text.strip()
+    # Регулярку под каждый заголовок не компилируем: сравниваем префикс напрямую
+    n = len(title_norm)
+    if trimmed[:n].lower() == title_norm.lower():
+        return trimmed[_RE_TITLE_SEP.match(trimmed, n).end():].strip()
     lines = trimmed.splitlines()
     if lines:
-        first = re.sub(r"\s+", " ", lines[0]).strip().lower()
+        first = _RE_WS.sub(" ", lines[0]).strip().lower()
         if first == title_norm.lower():
             return "\n".join(lines[1:]).strip()
     return trimmed.strip()
@@ -472,34 +913,38 @@ def extract_content_with_fallback(doc, selectors, title: str | None):
     for sel in selectors or []:
         if sel and sel not in ordered_selectors:
             ordered_selectors.append(sel)
-    for sel in DEFAULT_CONTENT_SELECTORS:
-        if sel not in ordered_selectors:
-            ordered_selectors.append(sel)
 
     soup = _clone_soup(doc)
     _clean_for_content(soup)
 
     candidates: list[tuple[int, str]] = []
     candidate_nodes = []
+    # Tag.__eq__ сравнивает поддеревья целиком, поэтому дубликаты ищем по id()
+    candidate_ids: set[int] = set()
 
-    for sel in ordered_selectors:
-        try:
-            nodes = soup.select(sel)
-        except Exception:
-            continue
-        for node in nodes:
-            if node in candidate_nodes:
-                continue
-            text = _normalize_whitespace(node.get_text("\n", strip=True))
-            if not text:
+    def selected_nodes():
+        for sel in ordered_selectors:
+            try:
+                yield from soup.select(sel)
+            except Exception:
                 continue
-            candidates.append((len(text), text))
-            candidate_nodes.append(node)
+        yield from iter_default_content_nodes(soup)
+
+    for node in selected_nodes():
+        if id(node) in candidate_ids:
+            continue
+        text = element_lines(node)
+        if not text:
+            continue
+        candidates.append((len(text), text))
+        candidate_nodes.append(node)
+        candidate_ids.add(id(node))
 
     article_node = soup.find("article")
-    if article_node and article_node not in candidate_nodes:
+    if article_node and id(article_node) not in candidate_ids:
         candidate_nodes.append(article_node)
-    if soup.body and soup.body not in candidate_nodes:
+        candidate_ids.add(id(article_node))
+    if soup.body and id(soup.body) not in candidate_ids:
         candidate_nodes.append(soup.body)
 
     best_text = ""
@@ -537,11 +982,10 @@ def extract_content_with_fallback(doc, selectors, title: str | None):
 def html_fragment_to_text(fragment: str) -> str:
     if not fragment:
         return ""
-    soup = BeautifulSoup(fragment, "html.parser")
+    soup = make_soup(fragment)
     for junk in soup.find_all(["script", "style", "noscript", "form", "iframe"]):
         junk.decompose()
-    text = soup.get_text("\n", strip=True)
-    return _normalize_whitespace(text)
+    return element_lines(soup)
 
 def extract_content_text(soup: BeautifulSoup, selectors=None):
     if isinstance(selectors, str):
@@ -555,20 +999,25 @@ def extract_content_text(soup: BeautifulSoup, selectors=None):
             return ""
         for junk in elem.find_all(["script", "style", "noscript", "form", "iframe"]):
             junk.decompose()
-        text = elem.get_text("\n", strip=True)
-        return _normalize_whitespace(text)
+        return element_lines(elem)
 
-    for sel in selectors + DEFAULT_CONTENT_SELECTORS:
-        if sel in tried:
-            continue
-        tried.append(sel)
-        for node in soup.select(sel):
-            text = element_text(node)
-            if len(text) >= 120:
-                return text
-            # Короткие карточки тоже могут встречаться
-            if len(text) >= 40:
-                return text
+    def selected_nodes():
+        for sel in selectors:
+            if sel in tried:
+                continue
+            tried.append(sel)
+            yield from soup.select(sel)
+        # Дефолтные селекторы — одним обходом; совпавшие с пользовательскими
+        # узлы уже проверены и дадут тот же короткий текст
+        yield from iter_default_content_nodes(soup)
+
+    for node in selected_nodes():
+        text = element_text(node)
+        if len(text) >= 120:
+            return text
+        # Короткие карточки тоже могут встречаться
+        if len(text) >= 40:
+            return text
 
     # Fallback: собрать параграфы из <article> или <body>
     container = soup.find("article") or soup.body
@@ -598,107 +1047,238 @@ META_DATE_KEYS = [
     ("meta", "itemprop", "datePublished"),
     ("meta", "itemprop", "dateCreated"),
 ]
-
-def extract_date_candidates(soup: BeautifulSoup):
-    out = []
-    # <time datetime="...">
-    for t in soup.find_all("time"):
-        dt = t.get("datetime") or t.get("content") or ""
-        if dt:
-            out.append(dt)
-        txt = t.get_text(strip=True)
-        if txt:
-            out.append(txt)
-    # meta
-    for tag, attr, key in META_DATE_KEYS:
-        for m in soup.find_all(tag, attrs={attr: key}):
-            val = m.get("content") or m.get("datetime") or ""
-            if val:
-                out.append(val)
-    # json-ld
-    for script in soup.find_all("script", type="application/ld+json"):
+META_DATE_INDEX = {(attr, key): idx for idx, (_tag, attr, key) in enumerate(META_DATE_KEYS)}
+JSONLD_DATE_KEYS = frozenset(("datePublished", "dateModified", "uploadDate"))
+META_DATE_ATTRS = tuple(dict.fromkeys(attr for _tag, attr, _key in META_DATE_KEYS))
+
+DATE_CONTAINER_SELECTORS = [
+    "span.date", ".news-date", ".news__date", ".article-date", ".post-date",
+    ".entry-date", ".published", ".article__date", ".article-info__date",
+    ".date-publication", ".date-time", ".meta__date", ".time__value",
+    ".date", ".time", "time[itemprop='datePublished']", ".news-detail__date",
+    ".presscenter_event_date", ".blog-post__date", ".news-item__date",
+    ".article__meta-date", ".card__date"
+]
+# Все контейнеры ищем одним обходом дерева, затем раскладываем по селекторам
+_DATE_CONTAINER_ANY = soupsieve.compile(", ".join(DATE_CONTAINER_SELECTORS))
+_DATE_CONTAINER_PATTERNS = [soupsieve.compile(sel) for sel in DATE_CONTAINER_SELECTORS]
+MAX_DATE_CANDIDATES = 20
+
+def _raw_date_candidates(soup: BeautifulSoup):
+    # Один проход по <time>/<meta>/<script>; порядок кандидатов прежний:
+    # сначала все <time>, затем meta в порядке META_DATE_KEYS, затем JSON-LD
+    time_vals = []
+    meta_vals = [[] for _ in META_DATE_KEYS]
+    ld_scripts = []
+    for el in soup.find_all(["time", "meta", "script"]):
+        if el.name == "time":
+            dt = el.get("datetime") or el.get("content") or ""
+            if dt:
+                time_vals.append(dt)
+            txt = el.get_text(strip=True)
+            if txt:
+                time_vals.append(txt)
+        elif el.name == "meta":
+            for attr in META_DATE_ATTRS:
+                idx = META_DATE_INDEX.get((attr, el.get(attr)))
+                if idx is None:
+                    continue
+                val = el.get("content") or el.get("datetime") or ""
+                if val:
+                    meta_vals[idx].append(val)
+        elif el.get("type") == "application/ld+json":
+            ld_scripts.append(el)
+    yield from time_vals
+    for vals in meta_vals:
+        yield from vals
+    # json-ld — разбираем, только если до него дошла очередь
+    for script in ld_scripts:
+        # .string — единственный текстовый узел <script>, без обхода потомков
+        raw = script.string
+        if raw is None:
+            raw = script.get_text()
+        if not raw or not raw.strip():
+            continue
         try:
-            data = json.loads(script.get_text(strip=True))
+            data = json_loads(str(raw))  # orjson не принимает подклассы str
         except Exception:
             continue
-        def walk(obj):
-            if isinstance(obj, dict):
-                for k, v in obj.items():
-                    if k in ("datePublished", "dateModified", "uploadDate"):
-                        if isinstance(v, str):
-                            out.append(v)
-                    walk(v)
+        # Обход в глубину явным стеком (в том же порядке, что и рекурсия);
+        # на стек кладём только контейнеры и строки под ключами дат
+        stack = [(None, data)] if isinstance(data, (dict, list)) else []
+        while stack:
+            key, obj = stack.pop()
+            if isinstance(obj, str):
+                yield obj
+            elif isinstance(obj, dict):
+                stack.extend(
+                    (k, v)
+                    for k, v in reversed(obj.items())
+                    if isinstance(v, (dict, list))
+                    or (k in JSONLD_DATE_KEYS and isinstance(v, str))
+                )
             elif isinstance(obj, list):
-                for it in obj:
-                    walk(it)
-        walk(data)
-    # Common date containers
-    for sel in [
-        "span.date", ".news-date", ".news__date", ".article-date", ".post-date",
-        ".entry-date", ".published", ".article__date", ".article-info__date",
-        ".date-publication", ".date-time", ".meta__date", ".time__value",
-        ".date", ".time", "time[itemprop='datePublished']", ".news-detail__date",
-        ".presscenter_event_date", ".blog-post__date", ".news-item__date",
-        ".article__meta-date", ".card__date"
-    ]:
-        for el in soup.select(sel):
-            txt = el.get_text(" ", strip=True)
-            if txt:
-                out.append(txt)
-    # De-duplicate preserving order
+                stack.extend((None, it) for it in reversed(obj) if isinstance(it, (dict, list)))
+    # Common date containers, grouped in DATE_CONTAINER_SELECTORS order
+    buckets = [[] for _ in DATE_CONTAINER_SELECTORS]
+    for el in _DATE_CONTAINER_ANY.select(soup):
+        txt = el.get_text(" ", strip=True)
+        if not txt:
+            continue
+        for idx, pattern in enumerate(_DATE_CONTAINER_PATTERNS):
+            if pattern.match(el):
+                buckets[idx].append(txt)
+    for vals in buckets:
+        yield from vals
+
+def iter_date_candidates(soup: BeautifulSoup):
+    """Yield unique date candidates lazily, in priority order."""
     seen = set()
-    uniq = []
-    for s in out:
+    for s in _raw_date_candidates(soup):
         if s in seen:
             continue
         seen.add(s)
-        uniq.append(s)
-    return uniq[:20]
+        yield s
+        if len(seen) >= MAX_DATE_CANDIDATES:
+            return
 
-def try_parse_any_date(candidates):
-    default_base = make_aware_msk(datetime.now(MSK).replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0))
-    for raw in candidates:
-        s = raw.strip()
-        # Try ISO-like first
+def extract_date_candidates(soup: BeautifulSoup):
+    return list(iter_date_candidates(soup))
+
+# Числовые даты целиком: 21.09.2024, 21/09/24 12:30, 2024/09/21 12:30:05 ...
+_RE_NUMERIC_DATE = re.compile(
+    r"(\d{1,4})[-./](\d{1,2})[-./](\d{1,4})(?:[ T,]+(\d{1,2}):(\d{2})(?::(\d{2}))?)?"
+)
+
+
+def parse_numeric_date(s: str):
+    """Build a datetime from a purely numeric date, day-first unless year-first."""
+    m = _RE_NUMERIC_DATE.fullmatch(s)
+    if not m:
+        return None
+    a, b, c, hh, mm, ss = m.groups()
+    if len(a) == 4:
+        y, mo, d = int(a), int(b), int(c)
+    elif len(c) == 4:
+        d, mo, y = int(a), int(b), int(c)
+    elif len(c) == 2 and len(a) <= 2:
+        d, mo, y = int(a), int(b), 2000 + int(c)
+    else:
+        return None
+    try:
+        return datetime(y, mo, d, int(hh or 0), int(mm or 0), int(ss or 0))
+    except ValueError:
+        return None
+
+
+def parse_date_fast(s: str):
+    """Parse ISO-8601 and numeric day-first dates without dateutil."""
+    # ISO всегда начинается с года — остальное не гоняем через исключение
+    if s[:4].isdigit():
+        if s[-1:] in ("Z", "z"):  # fromisoformat до 3.11 не понимает «Z»
+            s = s[:-1] + "+00:00"
         try:
-            dt = finalize_datetime(dparser.isoparse(s))
-            if dt: return dt
-        except Exception:
+            return datetime.fromisoformat(s)
+        except ValueError:
             pass
-        # Try generic parser in day-first mode
+    return parse_numeric_date(s)
+
+# Английские месяцы: RFC 2822 (RSS, meta) и «19 Sep 2024» / «September 19, 2024»
+_RE_EN_MONTH = re.compile(r"\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\b", re.IGNORECASE)
+_EN_DATE_FORMATS = (
+    "%d %b %Y", "%d %B %Y", "%b %d, %Y", "%B %d, %Y",
+    "%d %b %Y %H:%M", "%d %B %Y %H:%M", "%b %d, %Y %H:%M", "%B %d, %Y %H:%M",
+)
+
+
+def parse_en_date(s: str):
+    """Targeted English-month formats via C-level parsers, before fuzzy dateutil."""
+    if not _RE_EN_MONTH.search(s):
+        return None
+    try:
+        return parsedate_to_datetime(s)
+    except (TypeError, ValueError, IndexError):
+        pass
+    for fmt in _EN_DATE_FORMATS:
         try:
-            dt = finalize_datetime(dparser.parse(
-                s,
-                dayfirst=True,
-                fuzzy=True,
-                default=default_base,
-            ))
-            if dt: return dt
-        except Exception:
-            pass
-        # Try Russian words
+            return datetime.strptime(s, fmt)
+        except ValueError:
+            continue
+    return None
+
+@functools.lru_cache(maxsize=4)
+def _parse_default_base(year: int) -> datetime:
+    # Недостающие поля для dateutil: 1 января текущего года, полночь по Москве
+    return datetime(year, 1, 1, tzinfo=MSK)
+
+@functools.lru_cache(maxsize=8192)
+def parse_absolute_date(s: str):
+    """Parse one stripped candidate without relative words; memoized per run."""
+    # ISO-8601 and dd.mm.yyyy via the C-implemented parsers first
+    dt = finalize_datetime(parse_date_fast(s))
+    if dt: return dt
+    # Русские названия месяцев dateutil не понимает: fuzzy-разбор либо падает,
+    # либо теряет месяц, поэтому сразу разбираем словами
+    if _RE_WORDS_DATE.search(s):
         dt = parse_ru_date_words(s)
         if dt:
-            dt = finalize_datetime(dt)
-            if dt: return dt
+            return finalize_datetime(dt)
+    dt = finalize_datetime(parse_en_date(s))
+    if dt: return dt
+    # Try generic parser in day-first mode (--debug покажет, что ещё доходит сюда)
+    default_base = _parse_default_base(datetime.now(MSK).year)
+    try:
+        dt = finalize_datetime(dparser.parse(
+            s,
+            dayfirst=True,
+            fuzzy=True,
+            default=default_base,
+        ))
+        if dt:
+            logging.debug("Date via fuzzy dateutil: %r", s)
+            return dt
+    except Exception:
+        pass
+    # Остались только dd.mm.yyyy / dd.mm.yy внутри текста (словесная форма разобрана выше)
+    if "." in s:
+        dt = parse_ru_date_words(s)
+        if dt:
+            return finalize_datetime(dt)
+    return None
+
+def try_parse_any_date(candidates):
+    for raw in candidates:
+        s = raw.strip()
+        dt = parse_absolute_date(s)
+        if dt: return dt
         # Relative dates
         low = s.lower()
         if "сегодня" in low or "today" in low:
-            m = re.search(r"(\d{1,2}):(\d{2})", low)
+            m = _RE_HHMM.search(low)
             hh, mm = (int(m.group(1)), int(m.group(2))) if m else (12, 0)
             dt = make_aware_msk(datetime.now(MSK)).replace(hour=hh, minute=mm, second=0, microsecond=0)
             return dt
         if "вчера" in low or "yesterday" in low:
-            m = re.search(r"(\d{1,2}):(\d{2})", low)
+            m = _RE_HHMM.search(low)
             hh, mm = (int(m.group(1)), int(m.group(2))) if m else (12, 0)
             dt = make_aware_msk(datetime.now(MSK) - timedelta(days=1)).replace(hour=hh, minute=mm, second=0, microsecond=0)
             return dt
     return None
 
 # ---- Parsing ----
+TITLE_META_KEYS = (("property", "og:title"), ("name", "og:title"), ("name", "title"))
+
+
 def extract_title(soup: BeautifulSoup):
-    for sel in ["meta[property='og:title']", "meta[name='og:title']", "meta[name='title']"]:
-        tag = soup.select_one(sel)
+    # Один проход по <meta> вместо трёх select_one; берём первый тег каждого вида
+    first = [None] * len(TITLE_META_KEYS)
+    for tag in soup.find_all("meta"):
+        for idx, (attr, key) in enumerate(TITLE_META_KEYS):
+            if first[idx] is None and tag.get(attr) == key:
+                first[idx] = tag
+        if first[0] is not None:
+            break
+    for tag in first:
         if tag and tag.get("content"):
             return tag["content"].strip()
     h1 = soup.find(["h1", "h2"])
@@ -708,15 +1288,38 @@ def extract_title(soup: BeautifulSoup):
         return soup.title.string.strip()
     return None
 
-def build_item(url: str, source_name: str, html: str, content_selectors=None, src: dict | None = None):
-    soup = BeautifulSoup(html, "html.parser")
+def _needs_content_fallback(content_text: str | None, normalized_title: str) -> bool:
+    if not content_text:
+        return True
+    cmp_title = _RE_WS.sub(" ", normalized_title).strip().lower()
+    cmp_text = _RE_WS.sub(" ", content_text).strip().lower()
+    if cmp_title and cmp_text == cmp_title:
+        return True
+    return len(content_text) < 160
+
+
+def _extract_content(soup: BeautifulSoup, content_selectors, title: str) -> str | None:
+    content_text = extract_content_text(soup, selectors=content_selectors)
+    if _needs_content_fallback(content_text, _normalize_whitespace(title)):
+        fallback_text = extract_content_with_fallback(soup, content_selectors, title)
+        if fallback_text:
+            content_text = fallback_text
+    return content_text
+
+
+def parse_article(url: str, html: str, content_selectors=None) -> dict:
+    """CPU-only part of build_item: no network and no STATE access.
+
+    Arguments and result are plain data, so it can run in a worker process.
+    """
+    soup = make_soup(html)
     title = extract_title(soup) or url
-    cands = extract_date_candidates(soup)
-    dt = try_parse_any_date(cands)
+    # Кандидаты извлекаются лениво: разбор останавливается на первой удачной дате
+    dt = try_parse_any_date(iter_date_candidates(soup))
 
     # Fallback: URL like /2024/09/21/
     if dt is None:
-        m = re.search(r"/(20\d{2})/([01]\d)/([0-3]\d)/", url)
+        m = _RE_URL_DATE.search(url)
         if m:
             y, mo, d = map(int, m.groups())
             try:
@@ -724,62 +1327,159 @@ def build_item(url: str, source_name: str, html: str, content_selectors=None, sr
             except ValueError:
                 dt = None
 
-    item_id = hashlib.sha256(url.encode("utf-8")).hexdigest()
-    content_text = extract_content_text(soup, selectors=content_selectors)
-    normalized_title = _normalize_whitespace(title)
-    fallback_needed = False
-    if not content_text:
-        fallback_needed = True
+    content_text = _extract_content(soup, content_selectors, title)
+    amp_url = None
+    if not content_text and html.strip():
+        amp_url = find_amp_url(url, soup)
+    return {
+        "title": title,
+        "date_published": dt.isoformat() if dt else None,
+        "content_text": content_text,
+        "amp_url": amp_url,
+    }
+
+
+_PARSE_POOL: ProcessPoolExecutor | None = None
+_parse_pool_lock = threading.Lock()
+
+
+def get_parse_pool() -> ProcessPoolExecutor | None:
+    global _PARSE_POOL
+    if PARSE_WORKERS <= 0:
+        return None
+    with _parse_pool_lock:
+        if _PARSE_POOL is None:
+            # spawn: fork из процесса с потоками загрузки небезопасен
+            _PARSE_POOL = ProcessPoolExecutor(
+                max_workers=PARSE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _PARSE_POOL
+
+
+def shutdown_parse_pool() -> None:
+    global _PARSE_POOL
+    with _parse_pool_lock:
+        if _PARSE_POOL is not None:
+            _PARSE_POOL.shutdown()
+            _PARSE_POOL = None
+
+
+PARSED_CACHE_SIZE = 256
+# (url, digest HTML, селекторы) -> результат parse_article; порядок dict = LRU
+_PARSED_CACHE: dict[tuple, dict] = {}
+_parsed_cache_lock = threading.Lock()
+
+
+def _remember_parsed(key: tuple, parsed: dict) -> None:
+    with _parsed_cache_lock:
+        _PARSED_CACHE[key] = parsed
+        if len(_PARSED_CACHE) > PARSED_CACHE_SIZE:
+            del _PARSED_CACHE[next(iter(_PARSED_CACHE))]
+
+
+def submit_parse(url: str, html: str, content_selectors=None) -> Future:
+    """parse_article с памятью на повторные страницы в рамках прогона; результат — Future.
+
+    Одна и та же статья встречается в индексах нескольких источников; ключ —
+    хеш HTML, так что изменившаяся страница разбирается заново. Результат — копия.
+    С пулом процессов разбор идёт в фоне: поток загрузки не ждёт его и берёт
+    следующую статью. Без пула (и при попадании в память) Future уже готов.
+    """
+    if isinstance(content_selectors, (list, tuple)):
+        selectors_key = tuple(content_selectors)
     else:
-        cmp_title = re.sub(r"\s+", " ", normalized_title).strip().lower()
-        cmp_text = re.sub(r"\s+", " ", content_text).strip().lower()
-        if cmp_title and cmp_text == cmp_title:
-            fallback_needed = True
-        elif len(content_text) < 160:
-            fallback_needed = True
-
-    if fallback_needed:
-        fallback_text = extract_content_with_fallback(soup, content_selectors, title)
-        if fallback_text:
-            content_text = fallback_text
+        selectors_key = content_selectors
+    key = (url, hashlib.blake2b(html.encode("utf-8"), digest_size=16).digest(), selectors_key)
+    with _parsed_cache_lock:
+        parsed = _PARSED_CACHE.pop(key, None)
+        if parsed is not None:
+            _PARSED_CACHE[key] = parsed
+    if parsed is None:
+        parse_pool = get_parse_pool()
+        if parse_pool is not None:
+            future = parse_pool.submit(parse_article, url, html, content_selectors)
+
+            def remember(done: Future) -> None:
+                if not done.cancelled() and done.exception() is None:
+                    _remember_parsed(key, dict(done.result()))
+
+            future.add_done_callback(remember)
+            return future
+        parsed = parse_article(url, html, content_selectors)
+        _remember_parsed(key, parsed)
+    done: Future = Future()
+    done.set_result(dict(parsed))
+    return done
+
+
+def parse_article_cached(url: str, html: str, content_selectors=None) -> dict:
+    """Synchronous submit_parse: the parsed article dict (a private copy)."""
+    return submit_parse(url, html, content_selectors).result()
+
+
+def load_article(
+    url: str, src: dict, content_selectors=None, use_only_cache: bool = False
+) -> tuple[str, Future] | None:
+    """Скачать (или взять из кеша) и разобрать статью; вызывается из потоков загрузки.
+
+    Возвращает HTML и Future разбора (см. submit_parse). Если разбор уже готов,
+    AMP-версию тоже качаем здесь, чтобы её запрос шёл параллельно с остальными;
+    иначе её скачает build_item. None — истёк max-runtime.
+    """
+    if runtime_expired():
+        return None
+    if use_only_cache:
+        html = read_cached_page(url)
+        if html is None:
+            raise FileNotFoundError("cached copy missing during cooldown")
+    else:
+        html = fetch_page(url, src=src)
+    parsing = submit_parse(url, html, content_selectors)
+    if parsing.done() and not parsing.exception():
+        parsed = parsing.result()
+        if parsed["amp_url"]:
+            parsed["amp_html"] = fetch_amp_page(parsed["amp_url"], src=src)
+    return html, parsing
+
+
+def build_item(url: str, source_name: str, html: str, content_selectors=None, src: dict | None = None,
+               parsed: dict | None = None):
+    if parsed is None:
+        parsed = parse_article(url, html, content_selectors)
+    title = parsed["title"]
+    content_text = parsed["content_text"]
+
+    # id публикуется в ленте и служит ключом first_seen — хеш должен оставаться стабильным
+    item_id = hashlib.sha256(url.encode("utf-8")).hexdigest()
 
-    if not content_text and html.strip():
-        amp_html = fetch_amp_if_available(url, soup, src=src)
+    if parsed["amp_url"]:
+        # AMP-страница могла быть скачана заранее в потоке загрузки
+        if "amp_html" in parsed:
+            amp_html = parsed["amp_html"]
+        else:
+            amp_html = fetch_amp_page(parsed["amp_url"], src=src)
         if amp_html:
-            amp_soup = BeautifulSoup(amp_html, "html.parser")
-            content_text = extract_content_text(amp_soup, selectors=content_selectors)
-            if content_text:
-                cmp_title = re.sub(r"\s+", " ", normalized_title).strip().lower()
-                cmp_text = re.sub(r"\s+", " ", content_text).strip().lower()
-                if (cmp_title and cmp_text == cmp_title) or len(content_text) < 160:
-                    fallback_text = extract_content_with_fallback(amp_soup, content_selectors, title)
-                    if fallback_text:
-                        content_text = fallback_text
-            else:
-                fallback_text = extract_content_with_fallback(amp_soup, content_selectors, title)
-                if fallback_text:
-                    content_text = fallback_text
+            content_text = _extract_content(make_soup(amp_html), content_selectors, title)
 
     item = {
         "id": item_id,
         "url": url,
         "title": title,
-        "date_published": dt.isoformat() if dt else None,
+        "date_published": parsed["date_published"],
         "content_text": content_text,
         "tags": [],
         "source": source_name,
     }
 
     if not item["date_published"]:
-        first_seen_map = STATE.setdefault("first_seen", {})
-        cached = first_seen_map.get(item_id)
-        if cached:
-            item["date_published"] = cached
-        else:
-            seen_dt = make_aware_msk(datetime.now(MSK)).replace(second=0, microsecond=0)
-            iso = seen_dt.isoformat()
-            first_seen_map[item_id] = iso
-            item["date_published"] = iso
+        with _STATE_LOCK:
+            first_seen_map = STATE.setdefault("first_seen", {})
+            cached = first_seen_map.get(item_id)
+            if not cached:
+                seen_dt = make_aware_msk(datetime.now(MSK)).replace(second=0, microsecond=0)
+                cached = first_seen_map[item_id] = seen_dt.isoformat()
+        item["date_published"] = cached
 
     return item
 
@@ -797,6 +1497,64 @@ API_CONTENT_KEYS = [
 ]
 
 
+@contextlib.contextmanager
+def article_futures(urls, src: dict, content_selectors=None, use_only_cache: bool = False):
+    """Futures load_article для ``urls`` в исходном порядке (None в списке — без загрузки).
+
+    Все загрузки ставятся в очередь сразу; при выходе из блока — в том числе по
+    исключению — ещё не начатые отменяются, чтобы не нагружать хост впустую.
+    """
+    pool = ThreadPoolExecutor(max_workers=FETCH_WORKERS)
+    try:
+        yield [
+            None if url is None else pool.submit(load_article, url, src, content_selectors, use_only_cache)
+            for url in urls
+        ]
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+SEEN_URLS_KEEP = 500
+
+
+def seen_urls_for(src_name: str) -> tuple[list, set]:
+    """Окно «виденных» ссылок источника: список (для порядка) и множество (для проверок)."""
+    previous = STATE.get("seen_urls", {}).get(src_name) or []
+    return previous, set(previous)
+
+
+def seen_window(processed: list, previous: list, current) -> list:
+    """Сначала новые ссылки (в порядке обхода), затем старые, ещё встречающиеся в индексе."""
+    current = set(current)
+    # При --force обработанные ссылки могут уже быть в окне — не тратим на них слоты дважды
+    current.difference_update(processed)
+    tail = (u for u in previous if u in current)
+    return list(itertools.islice(itertools.chain(processed, tail), SEEN_URLS_KEEP))
+
+
+def _api_entry_text(entry: dict) -> str | None:
+    """Return article text embedded in an API entry, if any."""
+    containers = [entry]
+    attributes = entry.get("attributes")
+    if isinstance(attributes, dict):
+        containers.append(attributes)
+    for container in containers:
+        for key in API_CONTENT_KEYS:
+            raw_val = container.get(key)
+            if not isinstance(raw_val, str):
+                continue
+            val = raw_val.strip()
+            if not val:
+                continue
+            if "<" in val and ">" in val and _RE_HTML_TAG.search(val):
+                text_val = html_fragment_to_text(val)
+            else:
+                text_val = _normalize_whitespace(val)
+            if text_val:
+                return text_val
+    return None
+
+
 def harvest_json_source(src: dict, force: bool = False):
     endpoint = src.get("api_endpoint")
     if not endpoint:
@@ -806,42 +1564,29 @@ def harvest_json_source(src: dict, force: bool = False):
     src_name = src.get("name", "")
     logging.info("Harvest API: %s — %s", src_name, endpoint)
 
-    headers = {
-        "User-Agent": USER_AGENT,
-        "Accept": "application/json",
-        "Accept-Language": "ru,en;q=0.9",
-    }
-    host = urlparse(endpoint).netloc
-    delay = HOST_DELAY_OVERRIDES.get(host, HOST_DELAY_DEFAULT)
-    now = time.time()
-    sleep_for = _last_req_at[host] + delay - now
-    if sleep_for > 0:
-        time.sleep(sleep_for)
-
-    resp = SESSION.get(endpoint, headers=headers, timeout=REQUEST_TIMEOUT)
-    _last_req_at[host] = time.time()
-    if resp.status_code == 429:
-        ra = resp.headers.get("Retry-After")
-        try:
-            wait = int(ra) if ra else 5
-        except ValueError:
-            wait = 5
-        logging.warning("429 Too Many Requests (API): %s -> sleep %ss", endpoint, wait)
-        time.sleep(wait)
+    headers = API_REQUEST_HEADERS
+    host = url_host(endpoint)
+    with RATE_LIMITER.hold(host):
         resp = SESSION.get(endpoint, headers=headers, timeout=REQUEST_TIMEOUT)
-        _last_req_at[host] = time.time()
+        if resp.status_code == 429:
+            wait = _retry_after_seconds(resp)
+            logging.warning("429 Too Many Requests (API): %s -> sleep %ss", endpoint, wait)
+            RATE_LIMITER.defer(host, wait)
+            RATE_LIMITER.wait(host)
+            resp = SESSION.get(endpoint, headers=headers, timeout=REQUEST_TIMEOUT)
     resp.raise_for_status()
 
-    text = resp.text
-    idx_digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
-    ih = STATE.setdefault("index_hash", {})
-    if not force and ih.get(endpoint) == idx_digest:
+    # application/json обычно без charset: resp.text угадывал бы кодировку на каждом ответе
+    text = response_text(resp)
+    idx_digest = index_digest(text)
+    if not force and STATE.get("index_hash", {}).get(endpoint) == idx_digest:
         logging.info("Index unchanged (API): %s — %s", src.get("name"), endpoint)
         return []
-    ih[endpoint] = idx_digest
+    remember_index_digest(endpoint, idx_digest)
 
     try:
-        payload = resp.json()
+        # Тело уже декодировано для отпечатка — разбираем его же, без второго декодирования
+        payload = json_loads(text)
     except ValueError as exc:
         logging.error("  invalid JSON for %s: %s", src.get("name"), exc)
         return []
@@ -854,9 +1599,7 @@ def harvest_json_source(src: dict, force: bool = False):
     base_url = src.get("base_url") or endpoint
     max_links = int(src.get("max_links", MAX_LINKS_PER_SOURCE))
     min_words = int(src.get("min_words", 0) or 0)
-    seen_map = STATE.setdefault("seen_urls", {})
-    already_seen_list = list(seen_map.get(src["name"], []))
-    already_seen = set(already_seen_list)
+    already_seen_list, already_seen = seen_urls_for(src["name"])
 
     entries = []
     seen_links = set()
@@ -890,136 +1633,237 @@ def harvest_json_source(src: dict, force: bool = False):
             logging.info("  no new links for %s", src["name"])
             return []
 
+    if (
+        ARGS
+        and getattr(ARGS, "smoke", False)
+        and ARGS.limit_per_source is not None
+        and len(new_entries) > ARGS.limit_per_source
+    ):
+        if getattr(ARGS, "debug", False):
+            logging.debug(
+                "Skip deep fetch for %s (limit-per-source)",
+                new_entries[ARGS.limit_per_source][0],
+            )
+        new_entries = new_entries[: ARGS.limit_per_source]
+
+    content_selectors = src.get("content_selectors")
+
+    # Текст из API не требует запроса; остальные страницы качаем параллельно
+    api_texts = [_api_entry_text(entry) for _, entry in new_entries]
     items = []
     processed_links = []
-    for idx, (url, entry) in enumerate(new_entries):
-        if runtime_expired():
-            logging.info(
-                "  stop fetching more API items for %s due to max-runtime",
-                src.get("name"),
-            )
-            break
-        if (
-            ARGS
-            and getattr(ARGS, "smoke", False)
-            and ARGS.limit_per_source is not None
-            and idx >= ARGS.limit_per_source
-        ):
-            if getattr(ARGS, "debug", False):
-                logging.debug(
-                    "Skip deep fetch for %s (limit-per-source)",
-                    url,
+    with article_futures(
+        [None if api_text else url for (url, _), api_text in zip(new_entries, api_texts)],
+        src,
+        content_selectors,
+    ) as futures:
+        for (url, entry), api_text, future in zip(new_entries, api_texts, futures):
+            if runtime_expired():
+                logging.info(
+                    "  stop fetching more API items for %s due to max-runtime",
+                    src.get("name"),
                 )
-            break
-        try:
-            api_text = None
-            containers = [entry]
-            attributes = entry.get("attributes")
-            if isinstance(attributes, dict):
-                containers.append(attributes)
-            for container in containers:
-                for key in API_CONTENT_KEYS:
-                    raw_val = container.get(key)
-                    if not isinstance(raw_val, str):
-                        continue
-                    val = raw_val.strip()
-                    if not val:
-                        continue
-                    if "<" in val and ">" in val and re.search(r"<[a-zA-Z][^>]*>", val):
-                        text_val = html_fragment_to_text(val)
-                    else:
-                        text_val = _normalize_whitespace(val)
-                    if text_val:
-                        api_text = text_val
-                        break
+                break
+            try:
                 if api_text:
-                    break
-
-            if api_text:
-                html = ""
-                item = build_item(
-                    url,
-                    src_name,
-                    html,
-                    content_selectors=src.get("content_selectors"),
-                    src=src,
-                )
-                item["content_text"] = api_text
-                SOURCE_SUMMARY[src_name]["api_text"] += 1
-            else:
-                html = fetch_page(url, src=src)
-                item = build_item(
-                    url,
-                    src_name,
-                    html,
-                    content_selectors=src.get("content_selectors"),
-                    src=src,
-                )
-            title = entry.get("name") or entry.get("title")
-            if title:
-                item["title"] = title.strip()
-            date_val = entry.get("publishedAt") or entry.get("publishDate") or entry.get("publish_date")
-            if date_val:
-                try:
-                    dt = finalize_datetime(dparser.isoparse(date_val))
+                    html = ""
+                    item = build_item(
+                        url,
+                        src_name,
+                        html,
+                        content_selectors=src.get("content_selectors"),
+                        src=src,
+                    )
+                    item["content_text"] = api_text
+                    SOURCE_SUMMARY[src_name]["api_text"] += 1
+                else:
+                    loaded = future.result()
+                    if loaded is None:
+                        continue
+                    html, parsing = loaded
+                    item = build_item(
+                        url,
+                        src_name,
+                        html,
+                        content_selectors=content_selectors,
+                        src=src,
+                        parsed=parsing.result(),
+                    )
+                title = entry.get("name") or entry.get("title")
+                if title:
+                    item["title"] = title.strip()
+                date_val = entry.get("publishedAt") or entry.get("publishDate") or entry.get("publish_date")
+                if date_val:
+                    try:
+                        dt = finalize_datetime(dparser.isoparse(date_val))
+                        if dt:
+                            item["date_published"] = dt.isoformat()
+                    except Exception:
+                        pass
+                elif entry.get("publishDateRus"):
+                    dt = try_parse_any_date([entry["publishDateRus"]])
                     if dt:
                         item["date_published"] = dt.isoformat()
-                except Exception:
-                    pass
-            elif entry.get("publishDateRus"):
-                dt = try_parse_any_date([entry["publishDateRus"]])
-                if dt:
-                    item["date_published"] = dt.isoformat()
-            content_text = item.get("content_text") or ""
-            if not content_text.strip():
-                SOURCE_SUMMARY[src_name]["no_text"] += 1
-            if min_words and _word_count(content_text) < min_words:
-                SOURCE_SUMMARY[src_name]["short"] += 1
+                content_text = item.get("content_text") or ""
+                if not content_text.strip():
+                    SOURCE_SUMMARY[src_name]["no_text"] += 1
+                if min_words and _word_count(content_text) < min_words:
+                    SOURCE_SUMMARY[src_name]["short"] += 1
+                    processed_links.append(url)
+                    continue
+                SOURCE_SUMMARY[src_name]["total"] += 1
+                items.append(item)
                 processed_links.append(url)
-                continue
-            SOURCE_SUMMARY[src_name]["total"] += 1
-            items.append(item)
-            processed_links.append(url)
-        except Exception as e:
-            logging.warning("  skip %s: %s", url, e)
+            except Exception as e:
+                logging.warning("  skip %s: %s", url, e)
 
-    keep = 500
-    tail = [u for u in already_seen_list if u in entry_urls]
-    seen_map[src["name"]] = (processed_links + tail)[:keep]
+    window = seen_window(processed_links, already_seen_list, entry_urls)
+    with _STATE_LOCK:
+        STATE.setdefault("seen_urls", {})[src["name"]] = window
 
     return items
 
 
-def harvest_source(src: dict, force: bool = False):
-    stats = STATE.setdefault("stats", {})
-    cooldowns = stats.setdefault("cooldowns", {})
-    errors = stats.setdefault("errors", [])
+INDEX_STRAINER = SoupStrainer("a", href=True)
+
+
+def _pattern_tuple(value) -> tuple:
+    if not value:
+        return ()
+    if isinstance(value, (str, bytes)):
+        return (value,)
+    return tuple(p for p in value if p)
+
+
+@functools.lru_cache(maxsize=256)
+def substring_matcher(patterns: tuple):
+    """Одна регулярка-альтернация вместо any(p in href ...); None без паттернов."""
+    if not patterns:
+        return None
+    return re.compile("|".join(map(re.escape, dict.fromkeys(patterns))))
+
+
+# Обратные ссылки и условные группы: \1, (?P=name), (?(1)...)
+_RE_GROUP_REF = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+
+
+@functools.lru_cache(maxsize=256)
+def compile_source_patterns(patterns: tuple, kind: str, source_name: str | None) -> tuple:
+    """Compile include/exclude regexes of a source once per run.
+
+    Валидные шаблоны склеиваются в одну альтернацию — одна проверка на ссылку
+    вместо цикла по шаблонам. Шаблоны со ссылками на группы (нумерация при
+    склейке сдвинется) и несклеиваемые (глобальные флаги не в начале) остаются
+    отдельными регэкспами.
+    """
+    compiled = []
+    for pattern in patterns:
+        try:
+            compiled.append(re.compile(pattern))
+        except re.error as exc:
+            logging.warning(
+                "Invalid %s %r for %s: %s",
+                kind,
+                pattern,
+                source_name,
+                exc,
+            )
+    if len(compiled) > 1 and not any(_RE_GROUP_REF.search(r.pattern) for r in compiled):
+        try:
+            return (re.compile("|".join(f"(?:{r.pattern})" for r in compiled)),)
+        except re.error:
+            pass
+    return tuple(compiled)
+
+
+_ABSOLUTE_HREF_PREFIXES = ("http://", "https://")
+# Абсолютные ссылки, которые urljoin вернёт не как есть: пробелы/управляющие символы,
+# ;params, [IPv6], пустые ?/# и пустой хост
+_RE_HREF_NEEDS_JOIN = re.compile(r"[\s;\[\]\x00-\x1f\x7f]|\?(?:#|$)|#$|^https?://(?:[/?#]|$)")
+
+
+def join_href(base_url: str, href: str) -> str:
+    """urljoin(base_url, href) без разбора URL для обычных абсолютных ссылок."""
+    if href.startswith(_ABSOLUTE_HREF_PREFIXES) and not _RE_HREF_NEEDS_JOIN.search(href):
+        return href
+    return urljoin(base_url, href)
+
+
+def precompile_source_patterns(sources) -> None:
+    """Компилирует include/exclude всех источников при загрузке sources.json.
+
+    Ошибки в шаблонах видны в логе сразу, а harvest_source берёт готовые
+    регэкспы из кеша compile_source_patterns.
+    """
+    for src in sources:
+        for kind in ("include_regex", "exclude_regex"):
+            compile_source_patterns(_pattern_tuple(src.get(kind)), kind, src.get("name"))
+
+
+if lxml_etree is not None:
+    _XPATH_INDEX_ANCHORS = lxml_etree.XPath("//a[@href]")
+    _XPATH_XML_ANCHORS = lxml_etree.XPath("//*[local-name()='a'][@href]")
+    _XML_RECOVER_PARSER = lxml_etree.XMLParser(recover=True, encoding="utf-8")
+
+
+def iter_index_anchors(index_html: str, xml: bool = False):
+    """Anchors with href from an index page: one lxml XPath, BS4 without lxml."""
+    if lxml_etree is not None:
+        try:
+            if xml:
+                root = lxml_etree.fromstring(index_html.encode("utf-8"), _XML_RECOVER_PARSER)
+                return _XPATH_XML_ANCHORS(root) if root is not None else []
+            return _XPATH_INDEX_ANCHORS(lxml_html.fromstring(index_html))
+        except (lxml_etree.LxmlError, ValueError) as exc:
+            logging.debug("lxml failed on index (%s), falling back to BeautifulSoup", exc)
+    soup = make_soup(
+        index_html,
+        "lxml-xml" if xml else HTML_PARSER,
+        parse_only=INDEX_STRAINER,
+    )
+    return soup.find_all("a", href=True)
+
+
+def anchor_text_len(a, limit: int) -> int:
+    """len(a.get_text(strip=True)), counted only until ``limit`` is reached."""
+    pieces = getattr(a, "stripped_strings", None)
+    if pieces is None:  # lxml element
+        pieces = (t.strip() for t in a.itertext())
+    total = 0
+    for piece in pieces:
+        total += len(piece)
+        if total >= limit:
+            break
+    return total
+
 
+def harvest_source(src: dict, force: bool = False):
     src_name = src.get("name", "")
     start_url = src["start_url"]
     min_words = int(src.get("min_words", 0) or 0)
-    cache_path = PAGES_DIR / cache_key_for(start_url)
-    cooldown_until = cooldowns.get(start_url)
+    cooldown_until = (STATE.get("stats") or {}).get("cooldowns", {}).get(start_url)
     now = time.time()
     use_only_cache = False
     index_html = None
+    index_needs_caching = False
     if cooldown_until and cooldown_until > now:
         until_dt = datetime.fromtimestamp(cooldown_until, timezone.utc)
-        if cache_path.exists():
+        cached_index = read_cached_page(start_url)
+        if cached_index is not None:
             logging.warning(
                 "Skip due to active cooldown until %s (using cached index): %s — %s",
                 until_dt.isoformat(),
                 src.get("name"),
                 start_url,
             )
-            errors.append(
+            record_error(
                 {
                     "source": src.get("name"),
                     "url": start_url,
                     "error": f"cooldown active until {until_dt.isoformat()} -> used cache",
                 }
             )
-            index_html = cache_path.read_text(encoding="utf-8")
+            index_html = cached_index
             use_only_cache = True
         else:
             logging.warning(
@@ -1028,7 +1872,7 @@ def harvest_source(src: dict, force: bool = False):
                 src.get("name"),
                 start_url,
             )
-            errors.append(
+            record_error(
                 {
                     "source": src.get("name"),
                     "url": start_url,
@@ -1039,28 +1883,37 @@ def harvest_source(src: dict, force: bool = False):
 
     logging.info("Harvest: %s — %s", src["name"], start_url)
     if index_html is None:
+        # Индекс, уже учтённый в index_hash, при 304 не читаем с диска и не хешируем
+        known_index = not force and start_url in STATE.get("index_hash", {})
         try:
-            index_html = fetch_page(start_url, src=src)
+            index_html = fetch_page(
+                start_url, src=src, skip_if_unchanged=known_index, write_cache=False
+            )
+            if index_html is None:
+                logging.info("Index unchanged (304): %s — %s", src["name"], start_url)
+                return []
+            index_needs_caching = True
         except requests.HTTPError as exc:
             resp = exc.response
             status = resp.status_code if resp is not None else None
             if status in {500, 502, 503, 504}:
-                cooldowns[start_url] = time.time() + 6 * 3600
-                if cache_path.exists():
+                set_cooldown(start_url, 6 * 3600)
+                cached_index = read_cached_page(start_url)
+                if cached_index is not None:
                     logging.warning(
                         "Server error %s, using cached index + cooldown 6h: %s — %s",
                         status,
                         src.get("name"),
                         start_url,
                     )
-                    errors.append(
+                    record_error(
                         {
                             "source": src.get("name"),
                             "url": start_url,
                             "error": f"HTTP {status} -> used cache + cooldown 6h",
                         }
                     )
-                    index_html = cache_path.read_text(encoding="utf-8")
+                    index_html = cached_index
                     use_only_cache = True
                 else:
                     logging.warning(
@@ -1069,7 +1922,7 @@ def harvest_source(src: dict, force: bool = False):
                         src.get("name"),
                         start_url,
                     )
-                    errors.append(
+                    record_error(
                         {
                             "source": src.get("name"),
                             "url": start_url,
@@ -1080,21 +1933,22 @@ def harvest_source(src: dict, force: bool = False):
             else:
                 raise
         except requests.exceptions.RetryError as exc:
-            cooldowns[start_url] = time.time() + 6 * 3600
-            if cache_path.exists():
+            set_cooldown(start_url, 6 * 3600)
+            cached_index = read_cached_page(start_url)
+            if cached_index is not None:
                 logging.warning(
                     "Server error (retry exhausted), using cached index + cooldown 6h: %s — %s",
                     src.get("name"),
                     start_url,
                 )
-                errors.append(
+                record_error(
                     {
                         "source": src.get("name"),
                         "url": start_url,
                         "error": f"retry exhausted -> used cache + cooldown 6h: {exc}",
                     }
                 )
-                index_html = cache_path.read_text(encoding="utf-8")
+                index_html = cached_index
                 use_only_cache = True
             else:
                 logging.warning(
@@ -1102,7 +1956,7 @@ def harvest_source(src: dict, force: bool = False):
                     src.get("name"),
                     start_url,
                 )
-                errors.append(
+                record_error(
                     {
                         "source": src.get("name"),
                         "url": start_url,
@@ -1111,17 +1965,17 @@ def harvest_source(src: dict, force: bool = False):
                 )
                 return []
         except SourceTemporarilyUnavailable as exc:
-            failures = STATE.setdefault("stats", {}).setdefault("errors", [])
             logging.warning(
                 "Temporary unavailability for %s: %s", src.get("name"), exc
             )
-            if cache_path.exists():
+            cached_index = read_cached_page(start_url)
+            if cached_index is not None:
                 logging.warning(
                     "Using cached index due to host issue: %s — %s",
                     src.get("name"),
                     start_url,
                 )
-                failures.append(
+                record_error(
                     {
                         "source": src.get("name"),
                         "url": start_url,
@@ -1129,10 +1983,10 @@ def harvest_source(src: dict, force: bool = False):
                         "status": "cached",
                     }
                 )
-                index_html = cache_path.read_text(encoding="utf-8")
+                index_html = cached_index
                 use_only_cache = True
             else:
-                failures.append(
+                record_error(
                     {
                         "source": src.get("name"),
                         "url": start_url,
@@ -1143,115 +1997,74 @@ def harvest_source(src: dict, force: bool = False):
                 return []
 
     # Если содержимое ленты не изменилось — пропускаем весь источник
-    idx_digest = hashlib.sha256(index_html.encode("utf-8")).hexdigest()
-    ih = STATE.setdefault("index_hash", {})
-    if not force and ih.get(src["start_url"]) == idx_digest:
+    idx_digest = index_digest(index_html)
+    if not force and STATE.get("index_hash", {}).get(src["start_url"]) == idx_digest:
         logging.info("Index unchanged: %s — %s", src["name"], src["start_url"])
+        if index_needs_caching and not page_cache_path(start_url).exists():
+            write_cached_page(start_url, index_html)
         return []
-    ih[src["start_url"]] = idx_digest
+    remember_index_digest(src["start_url"], idx_digest)
+    # Неизменённый индекс уже лежит в кеше — пишем только новую версию
+    if index_needs_caching:
+        write_cached_page(start_url, index_html)
 
-    # XML/HTML автодетект
-    soup = BeautifulSoup(index_html, "xml" if index_html.lstrip().startswith("<?xml") else "html.parser")
+    # XML/HTML автодетект; из индекса нужны только ссылки
+    anchors = iter_index_anchors(index_html, xml=index_html.lstrip().startswith("<?xml"))
 
-    # Collect candidate links
-    links = []
-    include_patterns = src.get("include_patterns")
-    if include_patterns:
-        if isinstance(include_patterns, (str, bytes)):
-            include_patterns = [include_patterns]
-        else:
-            include_patterns = [p for p in include_patterns if p]
-    else:
-        include_patterns = []
-
-    include_regex = src.get("include_regex")
-    include_res = []
-    if include_regex:
-        raw_patterns = (
-            [include_regex]
-            if isinstance(include_regex, (str, bytes))
-            else [p for p in include_regex if p]
-        )
-        for pattern in raw_patterns:
-            try:
-                include_res.append(re.compile(pattern))
-            except re.error as exc:
-                logging.warning(
-                    "Invalid include_regex %r for %s: %s",
-                    pattern,
-                    src.get("name"),
-                    exc,
-                )
+    # Collect candidate links (dict как упорядоченное множество)
+    links: dict[str, None] = {}
+    include_any = substring_matcher(_pattern_tuple(src.get("include_patterns")))
 
-    exclude_regex = src.get("exclude_regex")
-    exclude_res = []
-    if exclude_regex:
-        raw_patterns = (
-            [exclude_regex]
-            if isinstance(exclude_regex, (str, bytes))
-            else [p for p in exclude_regex if p]
-        )
-        for pattern in raw_patterns:
-            try:
-                exclude_res.append(re.compile(pattern))
-            except re.error as exc:
-                logging.warning(
-                    "Invalid exclude_regex %r for %s: %s",
-                    pattern,
-                    src.get("name"),
-                    exc,
-                )
+    include_res = compile_source_patterns(
+        _pattern_tuple(src.get("include_regex")), "include_regex", src.get("name")
+    )
+    exclude_res = compile_source_patterns(
+        _pattern_tuple(src.get("exclude_regex")), "exclude_regex", src.get("name")
+    )
 
-    base_host = urlparse(src["base_url"]).netloc.replace("www.", "")
-    for a in soup.find_all("a"):
+    base_url = src["base_url"]
+    base_host = url_host(base_url).replace("www.", "")
+    # Текст ссылки считаем, только если источник задал минимальную длину
+    min_len = int(src.get("link_min_text_len", 0) or 0)
+    accept_empty_anchor = src.get("accept_empty_anchor")
+    restrict_domain = src.get("restrict_domain")
+    for a in anchors:
         href = a.get("href")
         if not href:
             continue
-        href = urljoin(src["base_url"], href)
+        href = join_href(base_url, href)
+        if href in links:
+            continue
         if is_listing_url(href):
             SOURCE_SUMMARY[src_name]["listing_filtered"] += 1
             if ARGS and getattr(ARGS, "debug", False):
                 logging.debug("Filtered listing URL: %s", href)
             continue
-        if src.get("restrict_domain"):
-            h = urlparse(href).netloc.replace("www.", "")
-            if h != base_host:
-                continue
-        if include_patterns and not any(p in href for p in include_patterns):
+        # url_host кеширует разбор — тот же хост потом нужен http_get для паузы по хосту
+        if restrict_domain and url_host(href).replace("www.", "") != base_host:
+            continue
+        if include_any and not include_any.search(href):
             continue
         if include_res and not any(r.search(href) for r in include_res):
             continue
         if exclude_res and any(r.search(href) for r in exclude_res):
             continue
-        text_ok = (a.get_text(strip=True) or "")
         # Allow empty anchors when source explicitly permits it
-        min_len = int(src.get("link_min_text_len", 0))
-        if len(text_ok) < min_len:
-            if src.get("accept_empty_anchor"):
+        if min_len and anchor_text_len(a, min_len) < min_len:
+            if accept_empty_anchor:
                 # fallback to attributes
                 txt2 = a.get("title") or a.get("aria-label") or ""
                 if len(txt2) < min_len:
                     pass  # still accept link
             else:
                 continue
-        links.append(href)
-
-    # Dedup and limit
-    uniq = []
-    seen = set()
-    for u in links:
-        if u in seen:
-            continue
-        seen.add(u)
-        uniq.append(u)
+        links[href] = None
 
     # лимит по источнику (берём из sources.json или общий DEFAULT)
-    uniq = uniq[: int(src.get("max_links", MAX_LINKS_PER_SOURCE)) ]
+    uniq = list(links)[: int(src.get("max_links", MAX_LINKS_PER_SOURCE)) ]
 
     # Обрабатываем только новые относительно последнего прогона
-    seen_map = STATE.setdefault("seen_urls", {})
-    already_seen_list = list(seen_map.get(src["name"], []))
-    already_seen = set(already_seen_list)
+    already_seen_list, already_seen = seen_urls_for(src["name"])
 
     if force:
         new_links = uniq  # при rebuild обрабатываем все доступные uniq-ссылки
@@ -1278,68 +2091,71 @@ def harvest_source(src: dict, force: bool = False):
         items.append(item)
         processed_links.append(url)
 
-    for idx, url in enumerate(new_links):
-        if runtime_expired():
-            logging.info(
-                "  stop fetching more items for %s due to max-runtime",
-                src.get("name"),
+    if (
+        ARGS
+        and getattr(ARGS, "smoke", False)
+        and ARGS.limit_per_source is not None
+        and len(new_links) > ARGS.limit_per_source
+    ):
+        if getattr(ARGS, "debug", False):
+            logging.debug(
+                "Skip deep fetch for %s (limit-per-source)",
+                new_links[ARGS.limit_per_source],
             )
-            break
-        if (
-            ARGS
-            and getattr(ARGS, "smoke", False)
-            and ARGS.limit_per_source is not None
-            and idx >= ARGS.limit_per_source
-        ):
-            if getattr(ARGS, "debug", False):
-                logging.debug(
-                    "Skip deep fetch for %s (limit-per-source)",
-                    url,
-                )
-            break
-        try:
-            if use_only_cache:
-                page_path = PAGES_DIR / cache_key_for(url)
-                if page_path.exists():
-                    html = page_path.read_text(encoding="utf-8")
-                else:
-                    raise FileNotFoundError("cached copy missing during cooldown")
-            else:
-                html = fetch_page(url, src=src)
-            item = build_item(
-                url,
-                src_name,
-                html,
-                content_selectors=src.get("content_selectors"),
-                src=src,
-            )
-            handle_item(item, url)
-        except SourceTemporarilyUnavailable as exc:
-            page_path = PAGES_DIR / cache_key_for(url)
-            if page_path.exists():
-                logging.warning(
-                    "  using cached copy for %s due to temporary issue: %s", url, exc
+        new_links = new_links[: ARGS.limit_per_source]
+
+    content_selectors = src.get("content_selectors")
+
+    # Страницы (и их AMP-версии) качаем и разбираем параллельно — пауза по хосту
+    # соблюдается в http_get; карточки собираем в исходном порядке ссылок.
+    with article_futures(new_links, src, content_selectors, use_only_cache) as futures:
+        for url, future in zip(new_links, futures):
+            if runtime_expired():
+                logging.info(
+                    "  stop fetching more items for %s due to max-runtime",
+                    src.get("name"),
                 )
-                html = page_path.read_text(encoding="utf-8")
+                break
+            try:
+                loaded = future.result()
+                if loaded is None:
+                    continue
+                html, parsing = loaded
                 item = build_item(
                     url,
                     src_name,
                     html,
-                    content_selectors=src.get("content_selectors"),
+                    content_selectors=content_selectors,
                     src=src,
+                    parsed=parsing.result(),
                 )
                 handle_item(item, url)
-            else:
-                logging.warning("  skip %s: %s", url, exc)
-        except Exception as e:
-            logging.warning("  skip %s: %s", url, e)
-
-    # обновим «виденные» ссылки — держим скользящее окно последних 500
-    keep = 500
-    # сначала — новые (в порядке обхода), затем часть старых, которые ещё встречаются в uniq
-    tail = [u for u in already_seen_list if u in uniq]
+            except SourceTemporarilyUnavailable as exc:
+                cached = read_cached_page(url)
+                if cached is not None:
+                    logging.warning(
+                        "  using cached copy for %s due to temporary issue: %s", url, exc
+                    )
+                    html = cached
+                    item = build_item(
+                        url,
+                        src_name,
+                        html,
+                        content_selectors=content_selectors,
+                        src=src,
+                        parsed=parse_article_cached(url, html, content_selectors),
+                    )
+                    handle_item(item, url)
+                else:
+                    logging.warning("  skip %s: %s", url, exc)
+            except Exception as e:
+                logging.warning("  skip %s: %s", url, e)
+
+    # обновим «виденные» ссылки — держим скользящее окно последних SEEN_URLS_KEEP
     # при rebuild тоже обновляем, чтобы после форс-прогона обычные запуски работали эффективно
-    seen_map[src["name"]] = (processed_links + tail)[:keep]
+    window = seen_window(processed_links, already_seen_list, uniq)
+    with _STATE_LOCK:
+        STATE.setdefault("seen_urls", {})[src["name"]] = window
 
     return items
 
@@ -1374,20 +2190,20 @@ def build_feed(all_items):
         else:
             by_url[u] = it
     items = []
+    # Необязательный стоп-фильтр: ищем его один раз, а не на каждой карточке
+    skip_keywords = globals().get("SKIP_KEYWORDS")
     for it in by_url.values():
-        title = (it.get("title") or "").strip()
-        url = it.get("url") or ""
-        if ('SKIP_KEYWORDS' in globals() and SKIP_KEYWORDS and (SKIP_KEYWORDS.search(title) or SKIP_KEYWORDS.search(url))):
-            continue
+        if skip_keywords:
+            title = (it.get("title") or "").strip()
+            url = it.get("url") or ""
+            if skip_keywords.search(title) or skip_keywords.search(url):
+                continue
         if not it.get("date_published"):
             continue
         items.append(it)
 
-    # Sort by date desc (новые сверху), nulls-last (но мы null уже отфильтровали)
-    def sort_key(x):
-        dp = x.get("date_published")
-        return (0, dp) if dp else (1, "")
-    items.sort(key=sort_key, reverse=True)
+    # Sort by date desc (новые сверху); карточки без даты уже отфильтрованы выше
+    items.sort(key=itemgetter("date_published"), reverse=True)
 
     feed = {
         "version": "https://jsonfeed.org/version/1.1",
@@ -1404,7 +2220,7 @@ def load_existing_feed_items():
     if not OUT_JSON.exists():
         return []
     try:
-        data = json.loads(OUT_JSON.read_text(encoding="utf-8"))
+        data = read_json(OUT_JSON)
         if isinstance(data, dict) and "items" in data and isinstance(data["items"], list):
             return data["items"]
         # на всякий случай поддержим старый формат (если кто-то сохранил чистый список)
@@ -1414,17 +2230,23 @@ def load_existing_feed_items():
         logging.warning("Cannot load existing feed (%s). Will start from fresh items.", e)
     return []
 
+# Поля с текстом: пустое новое значение не затирает сохранённое
+RICH_FIELDS = frozenset({"content_text", "content_html", "summary"})
+
+
+def has_rich_value(value) -> bool:
+    if value is None:
+        return False
+    if isinstance(value, str):
+        return value.strip() != ""
+    return True
+
+
 def merge_items(existing, new):
     """Склеить items, убрать дубликаты по URL, предпочитая новые записи и записи с заполненной датой."""
 
-    def has_rich_value(value):
-        if value is None:
-            return False
-        if isinstance(value, str):
-            return value.strip() != ""
-        return True
-
-    rich_fields = {"content_text", "content_html", "summary"}
+    first_seen_map = STATE.get("first_seen", {})
+    debug = bool(ARGS and getattr(ARGS, "debug", False))
 
     by_url = {}
     for it in existing:
@@ -1432,7 +2254,7 @@ def merge_items(existing, new):
         if not u:
             continue
         if is_listing_url(u):
-            if ARGS and getattr(ARGS, "debug", False):
+            if debug:
                 logging.debug("Drop listing URL from existing feed: %s", u)
             continue
         by_url[u] = it
@@ -1441,7 +2263,7 @@ def merge_items(existing, new):
         if not u:
             continue
         if is_listing_url(u):
-            if ARGS and getattr(ARGS, "debug", False):
+            if debug:
                 logging.debug("Skip listing URL from new items: %s", u)
             continue
         old = by_url.get(u)
@@ -1450,37 +2272,52 @@ def merge_items(existing, new):
             continue
 
         merged = dict(old)
+        # The new date may come from the first-seen fallback; then keep the
+        # previously stored publication date instead of the crawl timestamp.
+        new_date = it.get("date_published")
+        item_id = it.get("id") or old.get("id")
+        keep_old_date = bool(
+            new_date
+            and old.get("date_published")
+            and item_id
+            and first_seen_map.get(item_id) == new_date
+        )
         for key, value in it.items():
-            if key == "date_published":
-                old_date = old.get("date_published")
-                new_date = value
-                if old_date and new_date:
-                    item_id = it.get("id") or old.get("id")
-                    if item_id:
-                        first_seen_map = STATE.get("first_seen", {})
-                        fallback_date = first_seen_map.get(item_id)
-                        if fallback_date and fallback_date == new_date:
-                            # The new value comes from the first-seen fallback; keep the
-                            # previously stored publication date instead of overwriting it
-                            # with the crawl timestamp.
-                            continue
-            if key in rich_fields and not has_rich_value(value):
+            if key == "date_published" and keep_old_date:
+                continue
+            if key in RICH_FIELDS and not has_rich_value(value):
                 continue
             merged[key] = value
 
         by_url[u] = merged
 
-    merged = list(by_url.values())
-
     # Сортировка по дате у нас окончательно произойдёт в build_feed,
     # но слегка подсортируем тут, чтобы ограничение по размеру не «съело» самые новые.
-    merged.sort(key=lambda x: x.get("date_published") or "", reverse=True)
-
-    # Обрезка по размеру
-    if FEED_MAX_ITEMS and len(merged) > FEED_MAX_ITEMS:
-        merged = merged[:FEED_MAX_ITEMS]
+    def date_key(x):
+        return x.get("date_published") or ""
+
+    # Обрезка по размеру: nlargest == sorted(reverse=True)[:n], но O(n log k)
+    if FEED_MAX_ITEMS and len(by_url) > FEED_MAX_ITEMS:
+        return heapq.nlargest(FEED_MAX_ITEMS, by_url.values(), key=date_key)
+    return sorted(by_url.values(), key=date_key, reverse=True)
+
+def run_source(src: dict) -> list:
+    """Собрать один источник; ошибка пишется в stats.errors и не роняет прогон."""
+    if runtime_expired():
+        logging.info("Skip %s due to max-runtime limit", src.get("name"))
+        return []
+    try:
+        if src.get("mode") == "api":
+            items = harvest_json_source(src, force=ARGS.rebuild)
+        else:
+            items = harvest_source(src, force=ARGS.rebuild)
+    except Exception as e:
+        logging.error("  !! Failed: %s (%s)", src.get("name"), e)
+        record_error({"source": src.get("name"), "url": src.get("start_url"), "error": str(e)})
+        return []
+    logging.info("  -> %s: %d items", src.get("name"), len(items))
+    return items
 
-    return merged
 
 def main():
     global ARGS, CONNECT_TIMEOUT, READ_TIMEOUT, REQUEST_TIMEOUT, START_TIME, RUNTIME_EXCEEDED, _RUNTIME_LOGGED
@@ -1496,6 +2333,8 @@ def main():
     parser.add_argument("--debug", action="store_true", help="Enable verbose debug logging")
     ARGS = parser.parse_args()
 
+    setup_logging()
+    load_state()
     SOURCE_SUMMARY.clear()
     SOURCE_MIN_WORDS.clear()
 
@@ -1515,8 +2354,9 @@ def main():
         if ARGS.limit_per_source is None:
             ARGS.limit_per_source = 3
 
-    sources = json.loads((ROOT / "sources.json").read_text(encoding="utf-8"))
+    sources = read_json(ROOT / "sources.json")
     HOST_STRATEGIES.update(build_strategy_registry(sources))
+    precompile_source_patterns(sources)
 
     selected_sources = None
     if ARGS.sources:
@@ -1529,44 +2369,45 @@ def main():
 
     all_items = []
     seen_source_names = set()
+    runnable = []
     for src in sources:
         src_name = src.get("name", "")
         SOURCE_MIN_WORDS[src_name] = int(src.get("min_words", 0) or 0)
-        if runtime_expired():
-            logging.info("Stop processing further sources due to max-runtime limit")
-            break
         if not src.get('enabled', True):
             logging.info("Skip disabled source: %s — %s", src.get('name'), src.get('start_url'))
             continue
         if selected_sources and src.get("name") not in selected_sources:
             continue
         seen_source_names.add(src_name)
-        try:
-            if src.get("mode") == "api":
-                items = harvest_json_source(src, force=ARGS.rebuild)
-            else:
-                items = harvest_source(src, force=ARGS.rebuild)
-            logging.info("  -> %d items", len(items))
+        runnable.append(src)
+
+    # map сохраняет порядок sources.json, поэтому порядок карточек не зависит от потоков
+    with ThreadPoolExecutor(max_workers=max(1, min(SOURCE_WORKERS, len(runnable)))) as source_pool:
+        for items in source_pool.map(run_source, runnable):
             all_items.extend(items)
-        except Exception as e:
-            logging.error("  !! Failed: %s (%s)", src.get("name"), e)
-            STATE.setdefault("stats", {}).setdefault("errors", []).append({"source": src.get("name"), "url": src.get("start_url"), "error": str(e)})
 
     if selected_sources and ARGS.sources:
         missing = selected_sources - seen_source_names
         if missing:
             logging.warning("Requested sources not found or disabled: %s", ", ".join(sorted(missing)))
 
+    shutdown_parse_pool()
     log_source_summary()
 
     if not all_items and not ARGS.rebuild:
         # Нет новых карточек — ленту не переписываем, чтобы не обнулять историю
         existing_count = 0
         if OUT_JSON.exists():
-            try:
-                existing_count = len(json.loads(OUT_JSON.read_text(encoding="utf-8")).get("items", []))
-            except Exception:
-                existing_count = 0
+            # Число карточек уже записано при последнем сохранении ленты —
+            # разбираем unified.json, только если статистики ещё нет
+            cached_count = STATE.get("stats", {}).get("items")
+            if isinstance(cached_count, int):
+                existing_count = cached_count
+            else:
+                try:
+                    existing_count = len(read_json(OUT_JSON).get("items", []))
+                except Exception:
+                    existing_count = 0
         STATE.setdefault("stats", {})["last_run"] = datetime.now(timezone.utc).isoformat()
         STATE["stats"]["items"] = existing_count
         if not ARGS.dry_run:
@@ -1580,7 +2421,7 @@ def main():
         existing_items = load_existing_feed_items()
         feed = build_feed(existing_items)
         if not ARGS.dry_run:
-            OUT_JSON.write_text(json.dumps(feed, ensure_ascii=False, indent=2), encoding="utf-8")
+            write_json(OUT_JSON, feed)
         STATE.setdefault("stats", {})["last_run"] = datetime.now(timezone.utc).isoformat()
         STATE["stats"]["items"] = len(feed["items"])
         if not ARGS.dry_run:
@@ -1594,7 +2435,7 @@ def main():
     feed = build_feed(merged_raw)
 
     if not ARGS.dry_run:
-        OUT_JSON.write_text(json.dumps(feed, ensure_ascii=False, indent=2), encoding="utf-8")
+        write_json(OUT_JSON, feed)
     STATE.setdefault("stats", {})["last_run"] = datetime.now(timezone.utc).isoformat()
     STATE["stats"]["items"] = len(feed["items"])
     if not ARGS.dry_run:
@@ -9,6 +9,7 @@ import os
 import random
 import shutil
 import socket
+import threading
 import time
 from dataclasses import dataclass, field
 from typing import Any, Dict, Iterable, List, MutableMapping, Optional, Tuple
@@ -168,6 +169,93 @@ def build_strategy_registry(sources: Iterable[Dict[str, Any]]) -> Dict[str, Requ
     return mapping
 
 
+class HostRateLimiter:
+    """Thread-safe per-host pacing: one request in flight per host.
+
+    ``acquire`` takes the host and sleeps until its interval has passed;
+    ``release`` marks the request finished, so the next one starts an interval
+    after the previous response rather than after the previous start. Callers
+    for different hosts never wait on each other. ``www.example.com`` and
+    ``example.com`` share one host, since they are the same origin server.
+    """
+
+    def __init__(self, default_interval: float, overrides: Optional[Dict[str, float]] = None,
+                 override_jitter: float = 0.0):
+        self.default_interval = default_interval
+        self.overrides = {self._key(host): interval for host, interval in (overrides or {}).items()}
+        self.override_jitter = override_jitter
+        self._next_slot: Dict[str, float] = {}
+        self._host_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(host: str) -> str:
+        host = host.lower()
+        return host[4:] if host.startswith("www.") else host
+
+    def _host_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            lock = self._host_locks.get(key)
+            if lock is None:
+                lock = self._host_locks[key] = threading.Lock()
+            return lock
+
+    def interval_for(self, host: str) -> float:
+        interval = self.overrides.get(self._key(host))
+        if interval is None:
+            return self.default_interval
+        if self.override_jitter > 0:
+            interval += random.uniform(0, self.override_jitter)
+        return interval
+
+    def acquire(self, host: str) -> None:
+        """Block until ``host`` is free and its interval has passed; pair with ``release``."""
+
+        self._host_lock(self._key(host)).acquire()
+        self.wait(host)
+
+    def wait(self, host: str) -> None:
+        """Sleep until the next slot of a host the caller already holds (e.g. after ``defer``)."""
+
+        key = self._key(host)
+        with self._lock:
+            wait = self._next_slot.get(key, 0.0) - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+
+    def release(self, host: str, refund: bool = False) -> None:
+        """Finish the request: the next one may start an interval from now.
+
+        ``refund`` skips the interval, e.g. after a cheap 304 response.
+        """
+
+        key = self._key(host)
+        with self._lock:
+            now = time.monotonic()
+            until = now if refund else now + self.interval_for(host)
+            # defer() во время запроса (429) мог назначить паузу длиннее
+            self._next_slot[key] = max(self._next_slot.get(key, 0.0), until)
+        self._host_lock(key).release()
+
+    @contextlib.contextmanager
+    def hold(self, host: str):
+        """``acquire``/``release`` around a block."""
+
+        self.acquire(host)
+        try:
+            yield
+        finally:
+            self.release(host)
+
+    def defer(self, host: str, seconds: float) -> None:
+        """Push the next slot for ``host`` at least ``seconds`` into the future."""
+
+        key = self._key(host)
+        with self._lock:
+            until = time.monotonic() + max(0.0, seconds)
+            self._next_slot[key] = max(self._next_slot.get(key, 0.0), until)
+
+
 class HostClient:
     """Stateful HTTP client that honours the configured strategy."""
 
@@ -180,11 +268,20 @@ class HostClient:
         )
         self.stats_root = state.setdefault("stats", {}).setdefault("metrics", {}).setdefault(host, {})
         self._session: Session = self._create_session()
+        self._lock = threading.RLock()
         self._load_cached_cookies()
 
     # Public API ---------------------------------------------------------
     def get(self, url: str, headers: Dict[str, str], allow_redirects: bool = True, timeout: Optional[Tuple[float, float]] = None,
             proxies: Optional[Dict[str, str]] = None) -> Response:
+        # Warm-up, session resets and cookie capture share per-host state, so
+        # concurrent callers for the same host are serialised.
+        with self._lock:
+            return self._get(url, headers, allow_redirects, timeout, proxies)
+
+    # Internal helpers ---------------------------------------------------
+    def _get(self, url: str, headers: Dict[str, str], allow_redirects: bool, timeout: Optional[Tuple[float, float]],
+             proxies: Optional[Dict[str, str]]) -> Response:
         self._ensure_warmup(url)
         timeout_value = timeout or self.strategy.timeout
         metrics = {
@@ -259,7 +356,6 @@ class HostClient:
         error_summary = ", ".join(errors) or metrics.get("error") or "unknown error"
         raise SourceTemporarilyUnavailable(f"{self.host}: {error_summary}")
 
-    # Internal helpers ---------------------------------------------------
     def _create_session(self) -> Session:
         session = requests.Session()
         adapter = HTTPAdapter(max_retries=0)
@@ -523,6 +619,7 @@ class HostClient:
 
 __all__ = [
     "HostClient",
+    "HostRateLimiter",
     "RequestStrategy",
     "SourceTemporarilyUnavailable",
     "SeleniumUnavailable",
@@ -8,6 +8,11 @@ import json
 import pathlib
 from typing import Any, Tuple
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
 try:
     from scripts.url_filters import is_listing_url
 except ModuleNotFoundError:  # pragma: no cover - fallback when run as a script
@@ -15,7 +20,10 @@ except ModuleNotFoundError:  # pragma: no cover - fallback when run as a script
 
 
 def _load_items(path: pathlib.Path) -> list[dict[str, Any]]:
-    data = json.loads(path.read_text(encoding="utf-8"))
+    if orjson is not None:
+        data = orjson.loads(path.read_bytes())
+    else:
+        data = json.loads(path.read_text(encoding="utf-8"))
     if isinstance(data, dict):
         items = data.get("items", [])
     else:
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import re
 from urllib.parse import parse_qsl, urlparse
 
@@ -47,6 +48,10 @@ _HOST_LISTING_HUBS = {
 }
 
 
+_RE_RIA_STK_INDEX = re.compile(r"^/news/index\.php$", re.IGNORECASE)
+_RE_PAGEN_KEY = re.compile(r"PAGEN_\d+", re.IGNORECASE)
+
+
 def _path_segments(path: str) -> list[str]:
     if not path:
         return []
@@ -60,8 +65,12 @@ def _normalize_host(host: str) -> str:
     return host
 
 
+@functools.lru_cache(maxsize=16384)
 def is_listing_url(url: str | None) -> bool:
-    """Return True if the URL points to a listing/service page."""
+    """Return True if the URL points to a listing/service page.
+
+    Pure function of the URL, memoized: feed items and index links repeat across runs.
+    """
 
     if not url:
         return False
@@ -90,7 +99,7 @@ def is_listing_url(url: str | None) -> bool:
                 if hub_match:
                     break
                 return False
-    if host_no_www == "ria-stk.ru" and re.match(r"^/news/index\.php$", path, re.IGNORECASE):
+    if host_no_www == "ria-stk.ru" and _RE_RIA_STK_INDEX.match(path):
         if any(k.lower() == "element_id" and v for k, v in query_pairs):
             return False
 
@@ -134,7 +143,7 @@ def is_listing_url(url: str | None) -> bool:
             continue
         if key.lower() == "page":
             return True
-        if re.fullmatch(r"PAGEN_\d+", key, re.IGNORECASE):
+        if _RE_PAGEN_KEY.fullmatch(key):
             return True
         if key.upper() == "VOTE_ID":
             return True
@@ -1,3 +1,4 @@
+from scripts import aggregate
 from scripts.aggregate import extract_content_with_fallback
 
 
@@ -11,3 +12,93 @@ def test_not_equals_title():
     assert text.strip()
     assert text.strip() != title
     assert len(text) >= 20
+
+
+def test_parse_article_cached_reuses_result(monkeypatch):
+    calls = []
+    real_parse = aggregate.parse_article
+
+    def counting_parse(*args):
+        calls.append(args[0])
+        return real_parse(*args)
+
+    monkeypatch.setattr(aggregate, "parse_article", counting_parse)
+    monkeypatch.setattr(aggregate, "_PARSED_CACHE", {})
+    html = "<html><head><title>T</title></head><body><article><p>" + "текст " * 30 + "</p></article></body></html>"
+
+    first = aggregate.parse_article_cached("https://ex.ru/a", html)
+    first["amp_html"] = "mutated"
+    second = aggregate.parse_article_cached("https://ex.ru/a", html)
+    aggregate.parse_article_cached("https://ex.ru/a", html + " ")
+
+    assert calls == ["https://ex.ru/a", "https://ex.ru/a"]
+    assert "amp_html" not in second
+    assert second["title"] == "T"
+
+
+def test_extract_title_meta_priority():
+    html = (
+        "<html><head><meta name='title' content='Name title'>"
+        "<meta name='og:title' content=''><meta property='og:title' content=' OG '>"
+        "</head><body><h1>H1</h1></body></html>"
+    )
+    assert aggregate.extract_title(aggregate.make_soup(html)) == "OG"
+    html = "<html><head><meta name='og:title' content=''><meta name='title' content='T'></head></html>"
+    assert aggregate.extract_title(aggregate.make_soup(html)) == "T"
+    assert aggregate.extract_title(aggregate.make_soup("<h2>Sub</h2>")) == "Sub"
+
+
+def test_normalize_whitespace_drops_blank_lines():
+    text = "  Первый абзац \r\n\n \t \nВторой  абзац  третий   "
+    assert aggregate._normalize_whitespace(text) == "Первый абзац\nВторой  абзац\nтретий"
+
+
+def test_default_content_nodes_follow_selector_order():
+    soup = aggregate.make_soup(
+        "<body><div class='content'>c</div><article>a</article>"
+        "<div class='article__body'>b</div></body>"
+    )
+    nodes = list(aggregate.iter_default_content_nodes(soup))
+    assert [n.get_text() for n in nodes] == ["a", "b", "c"]
+
+
+def test_element_lines_matches_get_text_normalization():
+    soup = aggregate.make_soup("<div> a <b>b\r\n  c </b><p>\n</p><i>d\xa0</i></div>")
+    expected = aggregate._normalize_whitespace(soup.div.get_text("\n", strip=True))
+    assert aggregate.element_lines(soup.div) == expected == "a\nb\nc\nd"
+
+
+def test_parse_workers_from_env(monkeypatch, caplog):
+    monkeypatch.setattr(aggregate.os, "cpu_count", lambda: None)
+    assert aggregate._parse_workers_from_env("auto") == 1
+    assert aggregate._parse_workers_from_env(" 3 ") == 3
+    assert aggregate._parse_workers_from_env("-2") == 0
+    assert aggregate._parse_workers_from_env("") == 0
+    with caplog.at_level("WARNING"):
+        assert aggregate._parse_workers_from_env("yes") == 0
+    assert "PARSE_WORKERS" in caplog.text
+
+
+def _worker_probe():
+    # Выполняется в процессе разбора: что оставил там импорт aggregate
+    import logging
+
+    return len(logging.getLogger().handlers), sorted(k for k, v in aggregate.STATE.items() if v)
+
+
+def test_parse_pool_workers_skip_import_side_effects(monkeypatch):
+    monkeypatch.setattr(aggregate, "PARSE_WORKERS", 1)
+    monkeypatch.setattr(aggregate, "_PARSE_POOL", None)
+    monkeypatch.setattr(aggregate, "_PARSED_CACHE", {})
+    html = "<html><head><title>T</title></head><body><article><p>" + "текст " * 30 + "</p></article></body></html>"
+    try:
+        parsing = aggregate.submit_parse("https://ex.ru/a", html)
+        parsed = parsing.result(timeout=60)
+        handlers, filled_state = aggregate.get_parse_pool().submit(_worker_probe).result(timeout=60)
+    finally:
+        aggregate.shutdown_parse_pool()
+
+    assert parsed == aggregate.parse_article("https://ex.ru/a", html)
+    assert aggregate.parse_article_cached("https://ex.ru/a", html) == parsed
+    assert handlers == 0
+    assert filled_state == []
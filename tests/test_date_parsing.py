@@ -0,0 +1,91 @@
+import pathlib
+import sys
+from datetime import datetime
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+from bs4 import BeautifulSoup
+
+from scripts import aggregate
+from scripts.aggregate import (
+    extract_date_candidates,
+    parse_date_fast,
+    parse_en_date,
+    parse_numeric_date,
+    parse_ru_date_words,
+    try_parse_any_date,
+)
+
+
+def test_parse_date_fast_iso_and_dotted():
+    assert parse_date_fast("2024-09-21T10:00:00Z").utcoffset().total_seconds() == 0
+    assert parse_date_fast("21.09.2024 12:30").hour == 12
+    assert parse_date_fast("21.09.2024").day == 21
+    assert parse_date_fast("вчера") is None
+
+
+def test_try_parse_any_date_converts_to_msk():
+    dt = try_parse_any_date(["2024-09-21T10:00:00Z"])
+    assert dt.isoformat() == "2024-09-21T13:00:00+03:00"
+    dt = try_parse_any_date(["21.09.2024"])
+    assert dt.isoformat() == "2024-09-21T00:00:00+03:00"
+
+
+def test_extract_date_candidates_keeps_priority_order():
+    html = (
+        "<html><head>"
+        "<meta name='date' content='2024-01-02'>"
+        "<meta property='article:published_time' content='2024-01-01T10:00'>"
+        "<script type='application/ld+json'>{\"datePublished\": \"2024-02-01\"}</script>"
+        "</head><body><span class='date'>3 марта 2024</span>"
+        "<time datetime='2024-03-04'>4 марта</time></body></html>"
+    )
+    cands = extract_date_candidates(BeautifulSoup(html, "lxml"))
+    assert cands == [
+        "2024-03-04",
+        "4 марта",
+        "2024-01-01T10:00",
+        "2024-01-02",
+        "2024-02-01",
+        "3 марта 2024",
+    ]
+
+
+def test_date_containers_follow_selector_priority():
+    html = (
+        "<html><body><div class='news-date'>2 марта 2024</div>"
+        "<p class='time'>10:00</p><span class='date'>1 марта 2024</span></body></html>"
+    )
+    cands = extract_date_candidates(BeautifulSoup(html, "lxml"))
+    assert cands == ["1 марта 2024", "2 марта 2024", "10:00"]
+
+
+def test_parse_ru_date_words_matches_known_months_only():
+    assert parse_ru_date_words("19 Сентября 2024 12:34") == datetime(2024, 9, 19, 12, 34)
+    assert parse_ru_date_words("5 сен 2024") == datetime(2024, 9, 5)
+    assert parse_ru_date_words("12 новостей 2024") is None
+
+
+def test_parse_numeric_date_day_first_and_year_first():
+    assert parse_numeric_date("21/09/24 12:30") == datetime(2024, 9, 21, 12, 30)
+    assert parse_numeric_date("2024/09/21") == datetime(2024, 9, 21)
+    # Не день-месяц — оставляем dateutil
+    assert parse_numeric_date("09/13/2024") is None
+
+
+def test_ru_month_names_skip_dateutil(monkeypatch):
+    def boom(*args, **kwargs):
+        raise AssertionError("dateutil should not be called")
+
+    aggregate.parse_absolute_date.cache_clear()
+    monkeypatch.setattr(aggregate.dparser, "parse", boom)
+    dt = try_parse_any_date(["Опубликовано 19 сентября 2024 12:34"])
+    assert (dt.year, dt.month, dt.day, dt.hour, dt.minute) == (2024, 9, 19, 12, 34)
+
+
+def test_parse_en_date_targeted_formats():
+    rfc = parse_en_date("Thu, 19 Sep 2024 10:00:00 +0300")
+    assert (rfc.day, rfc.hour, rfc.utcoffset().total_seconds()) == (19, 10, 3 * 3600)
+    assert parse_en_date("19 Sep 2024") == datetime(2024, 9, 19)
+    assert parse_en_date("September 19, 2024 08:15") == datetime(2024, 9, 19, 8, 15)
+    assert parse_en_date("19.09.2024") is None
@@ -0,0 +1,145 @@
+import argparse
+import pathlib
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+import scripts.aggregate as aggregate
+
+
+def _fresh_state(monkeypatch):
+    state = {"headers": {}, "stats": {}, "index_hash": {}, "seen_urls": {}, "first_seen": {}}
+    monkeypatch.setattr(aggregate, "STATE", state)
+    monkeypatch.setattr(aggregate, "ARGS", None)
+    return state
+
+
+def test_harvest_source_cancels_queued_fetches_on_error(monkeypatch):
+    _fresh_state(monkeypatch)
+    index = "<html><body>" + "".join(f"<a href='/a/{i}'>Статья {i}</a>" for i in range(10)) + "</body></html>"
+    monkeypatch.setattr(aggregate, "fetch_page", lambda url, src=None, **kw: index)
+    monkeypatch.setattr(aggregate, "write_cached_page", lambda url, content: None)
+    monkeypatch.setattr(aggregate, "FETCH_WORKERS", 1)
+    fetched = []
+
+    def fake_load_article(url, src, content_selectors=None, use_only_cache=False):
+        fetched.append(url)
+        if len(fetched) == 1:
+            raise aggregate.SourceTemporarilyUnavailable("host down")
+        time.sleep(0.02)
+        return None
+
+    def broken_cache(url):
+        raise RuntimeError("cache unreadable")
+
+    monkeypatch.setattr(aggregate, "load_article", fake_load_article)
+    monkeypatch.setattr(aggregate, "read_cached_page", broken_cache)
+
+    src = {"name": "ex", "start_url": "https://ex.ru/", "base_url": "https://ex.ru"}
+    with pytest.raises(RuntimeError):
+        aggregate.harvest_source(src)
+    fetched_at_return = len(fetched)
+    time.sleep(0.1)
+
+    assert fetched_at_return < 10
+    assert len(fetched) == fetched_at_return
+
+
+def test_article_futures_skips_none_and_cancels_on_error(monkeypatch):
+    monkeypatch.setattr(aggregate, "FETCH_WORKERS", 1)
+    fetched = []
+
+    def fake_load_article(url, src, content_selectors=None, use_only_cache=False):
+        fetched.append(url)
+        time.sleep(0.02)
+        return None
+
+    monkeypatch.setattr(aggregate, "load_article", fake_load_article)
+
+    with pytest.raises(RuntimeError):
+        with aggregate.article_futures([None] + [f"https://ex.ru/a/{i}" for i in range(10)], {}) as futures:
+            assert futures[0] is None
+            futures[1].result()
+            raise RuntimeError("parse failed")
+    fetched_at_exit = len(fetched)
+    time.sleep(0.1)
+
+    assert fetched_at_exit < 10
+    assert len(fetched) == fetched_at_exit
+
+
+def test_run_source_records_failure(monkeypatch):
+    state = {"stats": {}}
+    monkeypatch.setattr(aggregate, "STATE", state)
+    monkeypatch.setattr(aggregate, "ARGS", argparse.Namespace(rebuild=False, max_runtime=None))
+
+    def boom(src, force=False):
+        raise RuntimeError("down")
+
+    monkeypatch.setattr(aggregate, "harvest_source", boom)
+    monkeypatch.setattr(aggregate, "harvest_json_source", lambda src, force=False: [{"url": src["name"]}])
+
+    assert aggregate.run_source({"name": "api", "mode": "api"}) == [{"url": "api"}]
+    assert aggregate.run_source({"name": "html", "start_url": "https://ex.ru/"}) == []
+    assert state["stats"]["errors"] == [{"source": "html", "url": "https://ex.ru/", "error": "down"}]
+
+
+def test_run_source_updates_state_from_parallel_sources(monkeypatch):
+    state = _fresh_state(monkeypatch)
+    monkeypatch.setattr(aggregate, "ARGS", argparse.Namespace(rebuild=False, max_runtime=None))
+
+    def fake_harvest(src, force=False):
+        name = src["name"]
+        for i in range(5):
+            url = f"https://ex.ru/{name}/{i}"
+            aggregate.remember_headers(url, {"ETag": f"{name}-{i}"})
+            aggregate.build_item(url, name, "<html><body><p>text</p></body></html>")
+        aggregate.set_cooldown(src["start_url"], 60)
+        aggregate.remember_index_digest(src["start_url"], name)
+        if int(name) % 2:
+            raise RuntimeError(f"down {name}")
+        return [{"url": name}]
+
+    monkeypatch.setattr(aggregate, "harvest_source", fake_harvest)
+    sources = [{"name": str(n), "start_url": f"https://ex.ru/{n}"} for n in range(16)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(aggregate.run_source, sources))
+
+    assert sum(len(r) for r in results) == 8
+    assert sorted(e["error"] for e in state["stats"]["errors"]) == sorted(f"down {n}" for n in range(1, 16, 2))
+    assert len(state["headers"]) == 16 * 5
+    assert len(state["first_seen"]) == 16 * 5
+    assert len(state["stats"]["cooldowns"]) == 16
+    assert state["index_hash"] == {f"https://ex.ru/{n}": str(n) for n in range(16)}
+
+
+class _JsonResponse:
+    status_code = 200
+    headers = {"Content-Type": "application/json"}
+
+    def __init__(self, payload: bytes):
+        self.content = payload
+
+    @property
+    def text(self):
+        raise AssertionError("resp.text guesses the charset")
+
+    def raise_for_status(self):
+        pass
+
+
+def test_harvest_json_source_decodes_body_without_charset_guessing(monkeypatch):
+    state = _fresh_state(monkeypatch)
+    body = '{"data": [{"url": "https://ex.ru/n/1", "title": "Новость", "body": "<p>Текст новости</p>"}]}'
+    monkeypatch.setattr(aggregate.SESSION, "get", lambda url, **kw: _JsonResponse(body.encode("utf-8")))
+    monkeypatch.setattr(aggregate.RATE_LIMITER, "interval_for", lambda host: 0.0)
+
+    items = aggregate.harvest_json_source({"name": "api", "api_endpoint": "https://ex.ru/api"}, force=True)
+
+    assert [(i["title"], i["content_text"]) for i in items] == [("Новость", "Текст новости")]
+    assert state["index_hash"]["https://ex.ru/api"] == aggregate.index_digest(body)
@@ -1,5 +1,6 @@
 import pathlib
 import sys
+import threading
 import time
 
 import pytest
@@ -11,6 +12,7 @@ sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
 from scripts.http_client import (
     DEFAULT_USER_AGENT,
     HostClient,
+    HostRateLimiter,
     RequestStrategy,
     SourceTemporarilyUnavailable,
     WarmupConfig,
@@ -235,3 +237,86 @@ def test_warmup_401_without_cookies_and_failed_selenium(monkeypatch):
     warmup_stats = state["stats"]["metrics"]["example.com"]["warmup"]
     assert warmup_stats["result"] == "selenium_failed"
     assert client.state_root.get("warmup_done") is not True
+
+
+def _fake_clock(monkeypatch):
+    clock = {"now": 100.0}
+    sleeps = []
+
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        clock["now"] += seconds
+
+    monkeypatch.setattr(time, "monotonic", lambda: clock["now"])
+    monkeypatch.setattr(time, "sleep", fake_sleep)
+    return clock, sleeps
+
+
+def test_rate_limiter_spaces_requests_per_host(monkeypatch):
+    _, sleeps = _fake_clock(monkeypatch)
+    limiter = HostRateLimiter(1.5, {"slow.example": 6.0})
+
+    for host in ("example.com", "slow.example", "example.com", "slow.example"):
+        with limiter.hold(host):
+            pass
+
+    assert sleeps == [1.5, 4.5]
+
+
+def test_rate_limiter_counts_interval_from_response_end(monkeypatch):
+    clock, sleeps = _fake_clock(monkeypatch)
+    limiter = HostRateLimiter(2.0)
+
+    with limiter.hold("example.com"):
+        clock["now"] += 5.0  # медленный ответ
+    with limiter.hold("example.com"):
+        pass
+
+    assert sleeps == [2.0]
+
+
+def test_rate_limiter_refund_releases_slot(monkeypatch):
+    _, sleeps = _fake_clock(monkeypatch)
+    limiter = HostRateLimiter(2.0)
+
+    limiter.acquire("example.com")
+    limiter.release("example.com", refund=True)
+    limiter.acquire("example.com")
+    limiter.release("example.com")
+
+    assert sleeps == []
+
+
+def test_rate_limiter_shares_slot_between_www_and_bare_host(monkeypatch):
+    _, sleeps = _fake_clock(monkeypatch)
+    limiter = HostRateLimiter(1.5, {"www.slow.example": 6.0})
+
+    with limiter.hold("www.slow.example"):
+        pass
+    with limiter.hold("slow.example"):
+        pass
+
+    assert sleeps == [6.0]
+
+
+def test_rate_limiter_allows_one_request_in_flight_per_host():
+    limiter = HostRateLimiter(0.0)
+    in_flight = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    def request():
+        with limiter.hold("example.com"):
+            with lock:
+                in_flight["now"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            time.sleep(0.01)
+            with lock:
+                in_flight["now"] -= 1
+
+    threads = [threading.Thread(target=request) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert in_flight["max"] == 1
@@ -0,0 +1,77 @@
+import pathlib
+import sys
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+import scripts.aggregate as aggregate
+
+
+class _Resp:
+    def __init__(self, status_code=200, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = b"<p>page</p>"
+        self.text = "<p>page</p>"
+
+    def raise_for_status(self):
+        pass
+
+
+LM = "Wed, 01 Jan 2025 00:00:00 GMT"
+
+
+def _setup(monkeypatch, get_response, head_response=None):
+    calls = []
+    state = {"headers": {"https://ex.ru/a": {"Last-Modified": LM}}}
+    monkeypatch.setattr(aggregate, "STATE", state)
+    monkeypatch.setattr(aggregate, "get_host_client", lambda url, src=None: None)
+    monkeypatch.setattr(aggregate.RATE_LIMITER, "interval_for", lambda host: 0.0)
+
+    def fake_get(url, **kwargs):
+        calls.append("GET")
+        return get_response
+
+    def fake_head(url, **kwargs):
+        calls.append("HEAD")
+        return head_response
+
+    monkeypatch.setattr(aggregate.SESSION, "get", fake_get)
+    monkeypatch.setattr(aggregate.SESSION, "head", fake_head)
+    return state, calls
+
+
+def test_http_get_skips_head_for_hosts_honouring_conditional_get(monkeypatch):
+    state, calls = _setup(monkeypatch, _Resp(304))
+
+    assert aggregate.http_get("https://ex.ru/a") == (None, {"Last-Modified": LM})
+    assert calls == ["GET"]
+    assert "ex.ru" not in state["conditional_get_ignored"]
+
+
+def test_http_get_flags_host_ignoring_conditional_get(monkeypatch):
+    state, calls = _setup(monkeypatch, _Resp(200, {"Last-Modified": LM}))
+
+    text, _ = aggregate.http_get("https://ex.ru/a")
+
+    assert text == "<p>page</p>"
+    assert calls == ["GET"]
+    assert state["conditional_get_ignored"] == {"ex.ru": True}
+
+
+def test_http_get_prechecks_flagged_host_and_paces_before_get(monkeypatch):
+    state, calls = _setup(
+        monkeypatch,
+        _Resp(200, {"Last-Modified": "Thu, 02 Jan 2025 00:00:00 GMT"}),
+        head_response=_Resp(200, {"Last-Modified": "Thu, 02 Jan 2025 00:00:00 GMT"}),
+    )
+    state["conditional_get_ignored"] = {"ex.ru": True}
+    acquired = []
+    real_acquire = aggregate.RATE_LIMITER.acquire
+    monkeypatch.setattr(
+        aggregate.RATE_LIMITER, "acquire", lambda host: (acquired.append(host), real_acquire(host))
+    )
+
+    aggregate.http_get("https://ex.ru/a")
+
+    assert calls == ["HEAD", "GET"]
+    assert acquired == ["ex.ru", "ex.ru"]
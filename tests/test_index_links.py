@@ -0,0 +1,67 @@
+import pathlib
+import sys
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+from scripts.aggregate import anchor_text_len, compile_source_patterns, iter_index_anchors, join_href, seen_window
+
+
+def test_iter_index_anchors_html_keeps_order_and_text():
+    html = (
+        "<html><body><a href='/a'> Первая <b>новость</b> </a>"
+        "<a>без ссылки</a><a href='/b' title='t'></a></body></html>"
+    )
+    anchors = list(iter_index_anchors(html))
+    assert [a.get("href") for a in anchors] == ["/a", "/b"]
+    assert anchor_text_len(anchors[0], 100) == len("Перваяновость")
+    assert anchor_text_len(anchors[0], 3) >= 3
+    assert anchor_text_len(anchors[1], 5) == 0
+    assert anchors[1].get("title") == "t"
+
+
+def test_iter_index_anchors_xml_with_declared_encoding():
+    xml = (
+        "<?xml version='1.0' encoding='windows-1251'?>"
+        "<feed><entry><a href='https://ex.ru/1'>Новость</a></entry></feed>"
+    )
+    anchors = list(iter_index_anchors(xml, xml=True))
+    assert [a.get("href") for a in anchors] == ["https://ex.ru/1"]
+    assert anchor_text_len(anchors[0], 100) == len("Новость")
+
+
+def test_iter_index_anchors_empty_page():
+    assert list(iter_index_anchors("")) == []
+
+
+def test_seen_window_new_first_without_duplicates():
+    previous = ["/old1", "/gone", "/old2"]
+    window = seen_window(["/new", "/old2"], previous, ["/new", "/old1", "/old2"])
+    assert window == ["/new", "/old2", "/old1"]
+
+
+def test_compile_source_patterns_combines_alternation():
+    (combined,) = compile_source_patterns(("/news/\\d+", "[", "/articles/"), "include_regex", "t")
+    assert combined.search("https://ex.ru/news/12")
+    assert combined.search("https://ex.ru/articles/x")
+    assert not combined.search("https://ex.ru/about")
+
+    separate = compile_source_patterns(("(a)\\1", "(b)\\1"), "include_regex", "t")
+    assert len(separate) == 2
+    assert any(r.search("bb") for r in separate)
+
+
+def test_join_href_matches_urljoin():
+    from urllib.parse import urljoin
+
+    base = "https://ex.ru/news/list?page=2"
+    for href in (
+        "https://other.ru/a/b?x=1#c",
+        "http://ex.ru/../a",
+        "https://ex.ru/a?",
+        "https:///a",
+        " https://ex.ru/a",
+        "/news/1",
+        "//cdn.ex.ru/x",
+        "item?id=3",
+    ):
+        assert join_href(base, href) == urljoin(base, href)
@@ -0,0 +1,90 @@
+import pathlib
+import sys
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+import requests
+from requests.utils import get_encoding_from_headers
+
+import scripts.aggregate as aggregate
+
+
+def _response(content: bytes, content_type: str) -> requests.Response:
+    resp = requests.Response()
+    resp._content = content
+    resp.headers["Content-Type"] = content_type
+    resp.encoding = get_encoding_from_headers(resp.headers)
+    return resp
+
+
+def test_page_cache_roundtrip_gzip(tmp_path, monkeypatch):
+    monkeypatch.setattr(aggregate, "PAGES_DIR", tmp_path)
+    url = "https://example.com/news/1?id=2"
+
+    assert aggregate.read_cached_page(url) is None
+    aggregate.write_cached_page(url, "<html>Привет</html>")
+
+    assert aggregate.page_cache_path(url).name.endswith(".html.gz")
+    assert aggregate.read_cached_page(url) == "<html>Привет</html>"
+
+
+def test_page_cache_reads_legacy_plain_html(tmp_path, monkeypatch):
+    monkeypatch.setattr(aggregate, "PAGES_DIR", tmp_path)
+    url = "https://example.com/news/2"
+    (tmp_path / aggregate.cache_key_for(url)).write_text("<p>old</p>", encoding="utf-8")
+
+    assert aggregate.read_cached_page(url) == "<p>old</p>"
+
+
+def test_page_cache_reads_pre_blake2b_query_key(tmp_path, monkeypatch):
+    monkeypatch.setattr(aggregate, "PAGES_DIR", tmp_path)
+    url = "https://example.com/news?page=2"
+    legacy = aggregate.cache_key_for(url, legacy_query_hash=True)
+    assert legacy != aggregate.cache_key_for(url)
+    with aggregate.gzip.open(tmp_path / f"{legacy}.gz", "wt", encoding="utf-8") as fh:
+        fh.write("<p>before rename</p>")
+
+    assert aggregate.read_cached_page(url) == "<p>before rename</p>"
+
+
+def test_fetch_page_not_modified(tmp_path, monkeypatch):
+    monkeypatch.setattr(aggregate, "PAGES_DIR", tmp_path)
+    monkeypatch.setattr(aggregate, "http_get", lambda url, **kwargs: (None, {}))
+    url = "https://example.com/news/"
+    aggregate.write_cached_page(url, "<p>index</p>")
+
+    assert aggregate.fetch_page(url) == "<p>index</p>"
+    assert aggregate.fetch_page(url, skip_if_unchanged=True) is None
+
+
+def test_response_text_uses_declared_charset_without_guessing():
+    html = "<html><head><meta charset='windows-1251'></head><body>Новости</body></html>"
+    resp = _response(html.encode("cp1251"), "text/html")
+    assert aggregate.response_text(resp) == html
+
+    resp = _response("Привет".encode("utf-8"), "text/html")
+    assert aggregate.response_text(resp) == "Привет"
+
+    resp = _response("Привет".encode("koi8-r"), "text/html; charset=koi8-r")
+    assert aggregate.response_text(resp) == "Привет"
+
+
+def test_cache_key_slug():
+    key = aggregate.cache_key_for("https://ex.ru/novosti/статья--2024/09/?id=1")
+    assert key.startswith("ex.ru-novosti-2024-09-")
+    assert key.endswith(".html")
+    assert aggregate.cache_key_for("https://ex.ru/") == "ex.ru-index.html"
+
+
+def test_write_cached_page_is_flushed_to_disk(tmp_path, monkeypatch):
+    monkeypatch.setattr(aggregate, "PAGES_DIR", tmp_path)
+    url = "https://example.com/news/3"
+    aggregate.write_cached_page(url, "<p>v1</p>")
+    aggregate.write_cached_page(url, "<p>v2</p>")
+    assert aggregate.read_cached_page(url) == "<p>v2</p>"
+
+    aggregate.flush_page_cache()
+
+    assert not aggregate._PENDING_PAGES
+    assert aggregate.page_cache_path(url).exists()
+    assert aggregate.read_cached_page(url) == "<p>v2</p>"
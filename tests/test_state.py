@@ -0,0 +1,22 @@
+import pathlib
+import sys
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
+
+import scripts.aggregate as aggregate
+
+
+def test_trim_state_history(monkeypatch):
+    state = {
+        "first_seen": {f"id{i}": "2024-01-01" for i in range(5)},
+        "stats": {"errors": [{"n": i} for i in range(5)], "cooldowns": {"old": 1.0, "new": 4e9}},
+    }
+    monkeypatch.setattr(aggregate, "STATE", state)
+    monkeypatch.setattr(aggregate, "MAX_STATE_FIRST_SEEN", 3)
+    monkeypatch.setattr(aggregate, "MAX_STATE_ERRORS", 2)
+
+    aggregate.trim_state_history()
+
+    assert list(state["first_seen"]) == ["id2", "id3", "id4"]
+    assert state["stats"]["errors"] == [{"n": 3}, {"n": 4}]
+    assert state["stats"]["cooldowns"] == {"new": 4e9}